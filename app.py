@@ -1,17 +1,45 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import gspread
+import hashlib
+import json
 import pytz 
 import numpy as np
+import os
+import pyarrow as pa
+import pyarrow.parquet as pq
+import queue
+import requests
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+from urllib3.util.retry import Retry
 
 
 
 # Define the timezone for Central Time (CDT/CST)
 CENTRAL_TZ = pytz.timezone('America/Chicago')
 
+# Line charts with more points than this switch from SVG to WebGL (Scattergl) traces
+WEBGL_POINT_THRESHOLD = 1000
+SCATTER_LABEL_LIMIT = 50
+
+# Raw sheet values are mirrored to Parquet files; copies younger than the TTL are read instead of the API
+SHEET_CACHE_TTL = 60  # seconds
+
+# Cell right of the summary table holding the fingerprint of the inputs the summary was built from
+FINGERPRINT_CELL = 'Z1'
+FINGERPRINT_COLUMN = 25
+
+# Each day's Target P&L is this share of its starting balance
+DAILY_TARGET_RATE = 0.04
+
 # --- Page Configuration ---
 st.set_page_config(
     page_title="Trading Performance Tracker",
@@ -21,73 +49,56 @@ st.set_page_config(
 )
 
 # --- PASSWORD PROTECTION ---
-def check_password():
-    """Returns `True` if the user had the correct password."""
+LOGIN_CSS = """
+    <style>
+    .main {
+        background: linear-gradient(135deg, #0a0e0f 0%, #0f1419 100%);
+        background-attachment: fixed;
+    }
+    </style>
+"""
+
+def _render_login(error=False):
+    """Password prompt shared by the first run and the retry after a wrong password."""
+    st.html(LOGIN_CSS)
+    st.markdown("<h1 style='text-align: center; color: #00ff88;'>🔒 Trading Performance Tracker</h1>", unsafe_allow_html=True)
+    st.markdown("<h3 style='text-align: center; color: #e8f5e9;'>Enter Password to Access</h3>", unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.text_input(
+            "Password", 
+            type="password", 
+            on_change=_password_entered, 
+            key="password",
+            label_visibility="collapsed",
+            placeholder="Enter password..."
+        )
+        if error:
+            st.error("😕 Password incorrect")
+        st.markdown("<p style='text-align: center; color: #b8c5b8; font-size: 0.9rem;'>Contact admin for access</p>", unsafe_allow_html=True)
+
+def _password_entered():
+    """Checks whether a password entered by the user is correct."""
+    # Get password from secrets, handle both quoted and unquoted formats
+    correct_password = str(st.secrets.get("app_password", "trading123")).strip().strip('"').strip("'")
+    entered_password = st.session_state["password"].strip()
     
-    def password_entered():
-        """Checks whether a password entered by the user is correct."""
-        # Get password from secrets, handle both quoted and unquoted formats
-        correct_password = str(st.secrets.get("app_password", "trading123")).strip().strip('"').strip("'")
-        entered_password = st.session_state["password"].strip()
-        
-        if entered_password == correct_password:
-            st.session_state["password_correct"] = True
-            del st.session_state["password"]  # Don't store password
-        else:
-            st.session_state["password_correct"] = False
+    if entered_password == correct_password:
+        st.session_state["password_correct"] = True
+        del st.session_state["password"]  # Don't store password
+    else:
+        st.session_state["password_correct"] = False
 
+def check_password():
+    """Returns `True` if the user had the correct password."""
     if "password_correct" not in st.session_state:
         # First run, show password input
-        st.markdown("""
-            <style>
-            .main {
-                background: linear-gradient(135deg, #0a0e0f 0%, #0f1419 100%);
-                background-attachment: fixed;
-            }
-            </style>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("<h1 style='text-align: center; color: #00ff88;'>🔒 Trading Performance Tracker</h1>", unsafe_allow_html=True)
-        st.markdown("<h3 style='text-align: center; color: #e8f5e9;'>Enter Password to Access</h3>", unsafe_allow_html=True)
-        
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.text_input(
-                "Password", 
-                type="password", 
-                on_change=password_entered, 
-                key="password",
-                label_visibility="collapsed",
-                placeholder="Enter password..."
-            )
-            st.markdown("<p style='text-align: center; color: #b8c5b8; font-size: 0.9rem;'>Contact admin for access</p>", unsafe_allow_html=True)
+        _render_login()
         return False
     elif not st.session_state["password_correct"]:
         # Password incorrect, show input + error
-        st.markdown("""
-            <style>
-            .main {
-                background: linear-gradient(135deg, #0a0e0f 0%, #0f1419 100%);
-                background-attachment: fixed;
-            }
-            </style>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("<h1 style='text-align: center; color: #00ff88;'>🔒 Trading Performance Tracker</h1>", unsafe_allow_html=True)
-        st.markdown("<h3 style='text-align: center; color: #e8f5e9;'>Enter Password to Access</h3>", unsafe_allow_html=True)
-        
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.text_input(
-                "Password", 
-                type="password", 
-                on_change=password_entered, 
-                key="password",
-                label_visibility="collapsed",
-                placeholder="Enter password..."
-            )
-            st.error("😕 Password incorrect")
-            st.markdown("<p style='text-align: center; color: #b8c5b8; font-size: 0.9rem;'>Contact admin for access</p>", unsafe_allow_html=True)
+        _render_login(error=True)
         return False
     else:
         # Password correct
@@ -98,309 +109,14 @@ if not check_password():
     st.stop()  # Do not continue if check fails
 
 # --- Custom CSS for Ultra Dark Green/Black Aesthetic ---
-st.markdown("""
-    <style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;800&display=swap');
-    
-    /* === REFINED COLOR PALETTE === */
-    /* Pure Black BG: #0a0e0f */
-    /* Dark Charcoal: #0f1419 */
-    /* Neon Green (Primary): #00ff88 */
-    /* Soft Green (Secondary): #00d97e */
-    /* Dark Green Accent: #1a4d3e */
-    /* Red (Loss): #ff4757 */
-    /* Text: #e8f5e9 */
-    
-    /* Main background - Pure black with subtle gradient */
-    .main {
-        background: linear-gradient(135deg, #0a0e0f 0%, #0f1419 100%);
-        background-attachment: fixed;
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-        background: rgba(15, 20, 25, 0.95);
-        backdrop-filter: blur(10px);
-        border-radius: 16px;
-        box-shadow: 0 8px 32px rgba(0, 255, 136, 0.1);
-        border: 1px solid rgba(0, 255, 136, 0.1);
-        margin: 1rem auto;
-    }
-    
-    /* Header styling - Neon green gradient */
-    h1 {
-        color: #f8fafc;
-        font-weight: 800;
-        font-size: 3rem !important;
-        text-align: center;
-        margin-bottom: 2rem;
-        background: linear-gradient(135deg, #00ff88, #00d97e);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        text-shadow: 0 0 30px rgba(0, 255, 136, 0.5);
-        filter: drop-shadow(0 0 20px rgba(0, 255, 136, 0.3));
-    }
-    
-    h2, h3 {
-        color: #e8f5e9;
-        font-weight: 700;
-        border-bottom: 2px solid rgba(0, 255, 136, 0.3);
-        padding-bottom: 8px;
-        margin-bottom: 20px;
-    }
-    
-    /* Sidebar - Deep black with green accent */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #0a0e0f 0%, #0f1419 100%);
-        border-right: 2px solid rgba(0, 255, 136, 0.2);
-    }
-    
-    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] {
-        color: #e8f5e9;
-    }
+# Base colors live in .streamlit/config.toml. The stylesheet is re-sent every run, since Streamlit
+# drops elements a rerun doesn't emit, but the file is only read once per process.
+@st.cache_resource
+def load_app_css():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'app.css')) as css_file:
+        return f"<style>{css_file.read()}</style>"
 
-    [data-testid="stSidebar"] h3 {
-        color: #00ff88 !important; 
-        text-shadow: 0 0 15px rgba(0, 255, 136, 0.6);
-        border-bottom: none;
-        font-weight: 800;
-    }
-    
-    /* Metric cards - Enhanced styling */
-    [data-testid="stMetricValue"] {
-        font-size: 2.2rem;
-        font-weight: 800;
-        color: #00ff88;
-        text-shadow: 0 0 15px rgba(0, 255, 136, 0.4);
-    }
-    
-    [data-testid="stMetricLabel"] {
-        color: #b8c5b8;
-        font-weight: 600;
-        font-size: 0.95rem;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    
-    [data-testid="stMetricDelta"] {
-        color: #00ff88;
-        font-weight: 700;
-    }
-    
-    /* Tabs - Sleek dark with neon green active state */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 12px;
-        background-color: rgba(15, 20, 25, 0.9);
-        border-radius: 12px;
-        padding: 0.75rem;
-        border: 1px solid rgba(0, 255, 136, 0.15);
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        height: 50px;
-        background-color: rgba(26, 77, 62, 0.2);
-        border-radius: 10px;
-        color: #b8c5b8;
-        font-weight: 600;
-        font-size: 1rem;
-        padding: 0 2rem;
-        transition: all 0.3s ease;
-        border: 1px solid transparent;
-    }
-    
-    .stTabs [data-baseweb="tab"]:hover {
-        background-color: rgba(26, 77, 62, 0.4);
-        border-color: rgba(0, 255, 136, 0.3);
-        transform: translateY(-2px);
-        color: #00ff88;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, rgba(0, 255, 136, 0.2), rgba(0, 217, 126, 0.2));
-        color: #00ff88 !important;
-        font-weight: 800;
-        box-shadow: 0 4px 20px rgba(0, 255, 136, 0.4);
-        border: 1px solid rgba(0, 255, 136, 0.5);
-    }
-    
-    /* Form styling - Dark with green accents */
-    .stForm {
-        background: linear-gradient(135deg, rgba(15, 20, 25, 0.95) 0%, rgba(26, 77, 62, 0.1) 100%);
-        border-radius: 15px;
-        padding: 2rem;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.6), 0 0 40px rgba(0, 255, 136, 0.05);
-        border: 2px solid rgba(0, 255, 136, 0.2);
-        backdrop-filter: blur(10px);
-    }
-    
-    /* Input fields - Dark with green focus */
-    .stTextInput input, .stNumberInput input, .stSelectbox select, .stDateInput input {
-        background-color: rgba(10, 14, 15, 0.95) !important;
-        color: #e8f5e9 !important;
-        border-radius: 10px;
-        border: 2px solid rgba(0, 255, 136, 0.2) !important;
-        padding: 0.75rem;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-    }
-    
-    .stTextInput input:focus, .stNumberInput input:focus, .stSelectbox select:focus, .stDateInput input:focus {
-        border-color: #00ff88 !important;
-        box-shadow: 0 0 0 3px rgba(0, 255, 136, 0.15) !important;
-        background-color: rgba(10, 14, 15, 1) !important;
-    }
-    
-    .stTextInput label, .stNumberInput label, .stSelectbox label, .stDateInput label {
-        color: #e8f5e9 !important;
-        font-weight: 600;
-        font-size: 0.95rem;
-    }
-    
-    /* Button styling - Neon green gradient */
-    .stButton button {
-        background: linear-gradient(135deg, #00ff88 0%, #00d97e 100%);
-        color: #0a0e0f;
-        font-weight: 800;
-        font-size: 1.1rem;
-        padding: 0.85rem 2rem;
-        border-radius: 12px;
-        border: none;
-        box-shadow: 0 4px 20px rgba(0, 255, 136, 0.4);
-        transition: all 0.3s ease;
-        width: 100%;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    
-    .stButton button:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 6px 30px rgba(0, 255, 136, 0.6);
-        background: linear-gradient(135deg, #00d97e 0%, #00ff88 100%);
-    }
-    
-    /* Secondary button (Reset) */
-    .stButton button[kind="secondary"] {
-        background: linear-gradient(135deg, rgba(255, 71, 87, 0.2), rgba(255, 71, 87, 0.3));
-        color: #ff4757;
-        border: 2px solid rgba(255, 71, 87, 0.5);
-        box-shadow: 0 4px 15px rgba(255, 71, 87, 0.2);
-    }
-    
-    .stButton button[kind="secondary"]:hover {
-        background: linear-gradient(135deg, rgba(255, 71, 87, 0.3), rgba(255, 71, 87, 0.4));
-        box-shadow: 0 6px 25px rgba(255, 71, 87, 0.4);
-    }
-    
-    /* Success/Error messages */
-    .stSuccess {
-        background-color: rgba(0, 255, 136, 0.15);
-        color: #00ff88;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 4px solid #00ff88;
-        backdrop-filter: blur(10px);
-    }
-    
-    .stError {
-        background-color: rgba(255, 71, 87, 0.15);
-        color: #ff4757;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 4px solid #ff4757;
-        backdrop-filter: blur(10px);
-    }
-    
-    /* Info box - Dark green theme instead of blue */
-    .stInfo {
-        background: linear-gradient(135deg, rgba(26, 77, 62, 0.3), rgba(0, 255, 136, 0.05));
-        border-left: 4px solid #00ff88;
-        color: #e8f5e9;
-        padding: 1rem;
-        border-radius: 10px;
-        backdrop-filter: blur(10px);
-        box-shadow: 0 2px 10px rgba(0, 255, 136, 0.1);
-    }
-    
-    .stInfo a {
-        color: #00ff88 !important;
-        font-weight: 600;
-    }
-    
-    /* Dataframe styling */
-    .dataframe {
-        border-radius: 12px;
-        overflow: hidden;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.6);
-        background-color: rgba(15, 20, 25, 0.95) !important;
-    }
-    
-    /* Chart containers */
-    .js-plotly-plot {
-        border-radius: 15px;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.6);
-        background: rgba(15, 20, 25, 0.95);
-        padding: 1.5rem;
-        border: 1px solid rgba(0, 255, 136, 0.1);
-    }
-    
-    /* Divider */
-    hr {
-        border: none;
-        height: 2px;
-        background: linear-gradient(90deg, transparent, rgba(0, 255, 136, 0.5), transparent);
-        margin: 2rem 0;
-    }
-    
-    /* Progress bar - Green for wins, Red for losses */
-    .stProgress > div > div > div:first-child {
-        background-color: rgba(26, 77, 62, 0.3) !important; 
-    }
-    .stProgress > div > div > div > div {
-        background-color: #00ff88 !important;
-        box-shadow: 0 0 10px rgba(0, 255, 136, 0.5);
-    }
-    .stProgress.loss > div > div > div > div {
-        background-color: #ff4757 !important;
-        box-shadow: 0 0 10px rgba(255, 71, 87, 0.5);
-    }
-    
-    /* Scrollbar styling */
-    ::-webkit-scrollbar {
-        width: 12px;
-        height: 12px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: rgba(15, 20, 25, 0.8);
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(135deg, #00ff88, #00d97e);
-        border-radius: 6px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: linear-gradient(135deg, #00d97e, #00ff88);
-    }
-    
-    /* Expander styling */
-    .streamlit-expanderHeader {
-        background-color: rgba(26, 77, 62, 0.2);
-        border-radius: 8px;
-        color: #e8f5e9;
-        font-weight: 600;
-    }
-    
-    .streamlit-expanderHeader:hover {
-        background-color: rgba(26, 77, 62, 0.3);
-        border-color: rgba(0, 255, 136, 0.3);
-    }
-    </style>
-""", unsafe_allow_html=True)
+st.html(load_app_css())
 
 
 # --- Configuration and Setup ---
@@ -413,7 +129,7 @@ else:
 
 # --- Utility Functions for Google Sheets Interaction ---
 
-@st.cache_resource(ttl=3600)
+@st.cache_resource(ttl=3600, show_spinner=False)
 def connect_gsheets():
     """Authenticates and returns a gspread client object."""
     if not SHEET_ID: return None
@@ -424,208 +140,509 @@ def connect_gsheets():
         st.error(f"Error connecting to Google Sheets. Check 'gcp_service_account' in secrets: {e}")
         return None
 
-@st.cache_data(ttl=60)
-def get_data_from_sheet(sheet_name):
-    """Retrieves data from a specific sheet as a pandas DataFrame using core gspread."""
+def values_to_frame(values):
+    """
+    Builds a DataFrame from a raw 2D list of sheet values, header row first.
+    The table ends at the first blank header cell; a fingerprint in FINGERPRINT_CELL goes to df.attrs.
+    """
+    if not values: return pd.DataFrame()
+    header, rows = values[0], values[1:]
+    fingerprint = header[FINGERPRINT_COLUMN] if len(header) > FINGERPRINT_COLUMN else ''
+    if '' in header:
+        header = header[:header.index('')]
+
+    # The Values API trims trailing empty cells, so pad short rows back to the header width
+    width = len(header)
+    # Cells arrive as strings (never NaN), so there's nothing for a dropna to remove; blank rows in the
+    # middle are kept so frame positions stay aligned with sheet rows for the row-diff write
+    rows = [row[:width] + [''] * (width - len(row)) for row in rows]
+    df = pd.DataFrame(rows, columns=header)
+
+    if fingerprint:
+        df.attrs['fingerprint'] = fingerprint
+    return df
+
+@st.cache_resource(show_spinner=False)
+def get_sheet_cache_dir():
+    """Private directory (mode 0700) for this process's Parquet copies, so other users on the host can't read the trades."""
+    return tempfile.mkdtemp(prefix="trading_tracker-")
+
+def sheet_cache_path(sheet_name):
+    """The copy is keyed by the spreadsheet ID, so a different sheet is never served another one's rows."""
+    sheet_key = hashlib.blake2b(str(SHEET_ID).encode(), digest_size=8).hexdigest()
+    return os.path.join(get_sheet_cache_dir(), f"{sheet_key}-{sheet_name}.parquet")
+
+def read_sheet_cache(sheet_name):
+    """Returns the local Parquet copy of a sheet as an Arrow table if it is younger than SHEET_CACHE_TTL, otherwise None."""
+    path = sheet_cache_path(sheet_name)
+    try:
+        if time.time() - os.path.getmtime(path) < SHEET_CACHE_TTL:
+            return pq.read_table(path)
+    except Exception:
+        pass
+    return None
+
+def write_sheet_cache(sheet_name, df, keep_age=False):
+    """
+    Stores a sheet's values locally as strings, the way the Values API returns them.
+    With keep_age the file keeps its previous mtime, so patching it doesn't extend its freshness.
+    `df` may also be an Arrow table that already holds only strings.
+    """
+    path = sheet_cache_path(sheet_name)
+    try:
+        mtime = os.path.getmtime(path) if keep_age else None
+        if isinstance(df, pa.Table):
+            table = df
+        else:
+            table = frame_to_table(df.astype(object).where(df.notna(), '').astype(str))
+        pq.write_table(table, path)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+    except Exception:
+        drop_sheet_cache(sheet_name)
+
+def drop_sheet_cache(*sheet_names):
+    for sheet_name in sheet_names:
+        try:
+            os.remove(sheet_cache_path(sheet_name))
+        except OSError:
+            pass
+
+def _is_missing_sheet_error(e):
+    """True when the Values API rejected a range because the tab does not exist."""
+    return isinstance(e, gspread.exceptions.APIError) and 'Unable to parse range' in str(e)
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_spreadsheet():
+    """Opens the spreadsheet once per process instead of on every sheet access."""
     gc = connect_gsheets()
-    if not gc: return pd.DataFrame()
+    if not gc: return None
+    return gc.open_by_key(SHEET_ID)
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_worksheet(sheet_name):
+    """Returns a cached worksheet handle, skipping the metadata lookup on repeat writes."""
+    spreadsheet = get_spreadsheet()
+    if not spreadsheet: return None
+    return spreadsheet.worksheet(sheet_name)
+
+def frame_to_table(df):
+    """Arrow table of a sheet frame; the frame's attrs (the summary fingerprint) ride along in the schema metadata."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if df.attrs:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'sheet_attrs': json.dumps(df.attrs).encode()})
+    return table
+
+def table_to_frame(table):
+    df = table.to_pandas()
+    metadata = table.schema.metadata or {}
+    if b'sheet_attrs' in metadata:
+        df.attrs.update(json.loads(metadata[b'sheet_attrs']))
+    return df
+
+EMPTY_TABLE = pa.table({})
+
+# The cached readers hold Arrow tables rather than DataFrames: st.cache_data copies its value on
+# every hit, and an Arrow table of string columns round-trips as a few buffers instead of one
+# Python object per cell. Callers get a fresh DataFrame from the get_data_from_* wrappers.
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_sheet_table(sheet_name):
+    if not SHEET_ID: return EMPTY_TABLE
+    cached = read_sheet_cache(sheet_name)
+    if cached is not None: return cached
     try:
-        spreadsheet = gc.open_by_key(SHEET_ID)
-        worksheet = spreadsheet.worksheet(sheet_name)
-        
-        data = worksheet.get_all_records()
-        df = pd.DataFrame(data)
-        
-        df = df.dropna(how='all')
-        
-        return df
-    except gspread.exceptions.WorksheetNotFound:
-        st.error(f"Worksheet '{sheet_name}' not found. Please ensure your Google Sheet has tabs named 'trades' and 'daily_summary'.")
-        return pd.DataFrame()
+        spreadsheet = get_spreadsheet()
+        if not spreadsheet: return EMPTY_TABLE
+
+        # One values.get request for the whole tab; numeric columns are coerced once in load_data
+        values = spreadsheet.values_get(sheet_name).get('values', [])
+        df = values_to_frame(values)
+        write_sheet_cache(sheet_name, df)
+        return frame_to_table(df)
     except Exception as e:
-        st.error(f"Error reading data from sheet '{sheet_name}': {e}")
-        return pd.DataFrame()
+        if _is_missing_sheet_error(e):
+            st.error(f"Worksheet '{sheet_name}' not found. Please ensure your Google Sheet has tabs named 'trades' and 'daily_summary'.")
+        else:
+            st.error(f"Error reading data from sheet '{sheet_name}': {e}")
+        return EMPTY_TABLE
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_sheet_tables(sheet_names):
+    if not SHEET_ID: return [EMPTY_TABLE for _ in sheet_names]
+    cached = [read_sheet_cache(sheet_name) for sheet_name in sheet_names]
+    missing = [sheet_name for sheet_name, table in zip(sheet_names, cached) if table is None]
+    if not missing: return cached
+    try:
+        spreadsheet = get_spreadsheet()
+        if not spreadsheet: return [EMPTY_TABLE for _ in sheet_names]
+
+        # Only the tabs without a fresh local copy go into the batch request
+        value_ranges = spreadsheet.values_batch_get(missing).get('valueRanges', [])
+        fetched = {}
+        for sheet_name, value_range in zip(missing, value_ranges):
+            df = values_to_frame(value_range.get('values', []))
+            write_sheet_cache(sheet_name, df)
+            fetched[sheet_name] = frame_to_table(df)
+        return [fetched[sheet_name] if table is None else table for sheet_name, table in zip(sheet_names, cached)]
+    except Exception as e:
+        if _is_missing_sheet_error(e):
+            st.error("Worksheet not found. Please ensure your Google Sheet has tabs named 'trades' and 'daily_summary'.")
+        else:
+            st.error(f"Error reading data from sheets {', '.join(sheet_names)}: {e}")
+        return [EMPTY_TABLE for _ in sheet_names]
+
+def get_data_from_sheet(sheet_name):
+    """Retrieves data from a specific sheet as a pandas DataFrame using core gspread."""
+    return table_to_frame(_get_sheet_table(sheet_name))
 
+def get_data_from_sheets(sheet_names):
+    """Retrieves several sheets in a single values.batchGet request, one DataFrame per sheet name."""
+    return [table_to_frame(table) for table in _get_sheet_tables(tuple(sheet_names))]
 
-def write_data_to_sheet(sheet_name, df, mode='append'):
-    """Writes a DataFrame to a specific sheet using core gspread."""
-    gc = connect_gsheets()
-    if not gc: return False
+def clear_sheet_cache(*sheet_names, local=False):
+    """
+    Invalidates cached sheet reads, including the typed frames built from them.
+    Given sheet names, only those single-sheet entries are dropped and the others stay warm.
+    With local=True the Parquet copies are dropped too, so the next read goes to Google Sheets.
+    """
+    if sheet_names:
+        for sheet_name in sheet_names:
+            _get_sheet_table.clear(sheet_name)
+    else:
+        _get_sheet_table.clear()
+    _get_sheet_tables.clear()
+    load_data.clear()
+    if local:
+        drop_sheet_cache('trades', 'daily_summary')
+
+
+def normalize_sheet_rows(df):
+    """Returns the rows of a frame as tuples where numeric cells compare by value, not by formatting."""
+    cells = df.astype(object).where(df.notna(), '')
+    normalized = {}
+    for col in cells.columns:
+        numeric = pd.to_numeric(cells[col], errors='coerce').round(6)
+        normalized[col] = numeric.astype(object).where(numeric.notna(), cells[col].astype(str).str.strip())
+    return list(pd.DataFrame(normalized, columns=cells.columns).itertuples(index=False, name=None))
+
+def report_sheet_error(message, errors=None):
+    """Shows a sheet error, or collects it in `errors` when running off the script thread."""
+    if errors is None:
+        st.error(message)
+    else:
+        errors.append(message)
+
+def write_data_to_sheet(sheet_name, df, mode='append', previous=None, errors=None):
+    """
+    Writes a DataFrame to a specific sheet using core gspread.
+    In 'replace' mode, passing the rows the sheet holds now, in sheet order, as `previous` rewrites only
+    the rows that changed. A prepared (sorted, typed) frame is not that, so pass None to rewrite it all.
+    A replace also stores df.attrs['fingerprint'] in FINGERPRINT_CELL (blank if unset) when it differs from previous.
+    Failures go to `errors` when given, instead of st.error.
+    """
+    if not SHEET_ID: return False
     try:
-        spreadsheet = gc.open_by_key(SHEET_ID)
-        worksheet = spreadsheet.worksheet(sheet_name)
+        worksheet = get_worksheet(sheet_name)
+        if not worksheet: return False
         
         data_to_write = df.values.tolist()
+        fingerprint = df.attrs.get('fingerprint', '')
+        fingerprint_changed = previous is None or previous.attrs.get('fingerprint', '') != fingerprint
         
         if mode == 'append':
             worksheet.append_rows(data_to_write, value_input_option='USER_ENTERED')
             
+        elif mode == 'replace' and previous is not None and list(previous.columns) == list(df.columns) and len(previous) <= len(df):
+            # Same header and no rows to remove: send one batch with just the mutated rows
+            old_rows = normalize_sheet_rows(previous)
+            new_rows = normalize_sheet_rows(df)
+            updates = [
+                {'range': f'A{i + 2}', 'values': [data_to_write[i]]}
+                for i, row in enumerate(new_rows)
+                if i >= len(old_rows) or row != old_rows[i]
+            ]
+            if fingerprint_changed:
+                updates.append({'range': FINGERPRINT_CELL, 'values': [[fingerprint]]})
+            if not updates:
+                return True
+            worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+            
         elif mode == 'replace':
             header = [str(col) for col in df.columns.tolist()]
             full_data = [header] + data_to_write
             
-            worksheet.clear()
-            # worksheet.update('A1', full_data, value_input_option='USER_ENTERED')
-            worksheet.update(values=full_data, range_name='A1', value_input_option='USER_ENTERED')
-
+            # Overwrite in place with one values.batchUpdate so the sheet is never left empty,
+            # then clear leftover rows only if the old data could have been longer
+            data = [{'range': f"'{sheet_name}'!A1", 'values': full_data}]
+            if fingerprint_changed:
+                data.append({'range': f"'{sheet_name}'!{FINGERPRINT_CELL}", 'values': [[fingerprint]]})
+            get_spreadsheet().values_batch_update({'valueInputOption': 'USER_ENTERED', 'data': data})
+            if previous is None or len(previous) > len(df):
+                worksheet.batch_clear([f'A{len(full_data) + 1}:Z'])
+
+        # Mirror the write into the local copy so the next read doesn't need the API
+        if mode == 'append':
+            cached = read_sheet_cache(sheet_name)
+            if cached is not None and cached.column_names == list(df.columns):
+                write_sheet_cache(sheet_name, pd.concat([table_to_frame(cached), df], ignore_index=True), keep_age=True)
+            else:
+                drop_sheet_cache(sheet_name)
+        else:
+            write_sheet_cache(sheet_name, df)
         
-        get_data_from_sheet.clear()
+        # The session frames and the local copy already reflect the write, so only this sheet's
+        # memoized read is dropped; re-reading it is served from the Parquet copy
+        clear_sheet_cache(sheet_name)
         
         return True
     except Exception as e:
-        st.error(f"Error writing data to sheet '{sheet_name}': {e}")
+        report_sheet_error(f"Error writing data to sheet '{sheet_name}': {e}", errors)
+        return False
+
+def append_rows_to_sheet(sheet_name, columns, rows, errors=None):
+    """
+    Appends plain row lists, with values in `columns` order, in one append_rows call.
+    Submitted trades are dicts, so this skips building a DataFrame only to turn it back into lists.
+    """
+    if not SHEET_ID: return False
+    try:
+        worksheet = get_worksheet(sheet_name)
+        if not worksheet: return False
+
+        worksheet.append_rows(rows, value_input_option='USER_ENTERED')
+
+        # Mirror the rows into the local copy as strings, like the rest of it
+        cached = read_sheet_cache(sheet_name)
+        if cached is not None and cached.column_names == list(columns):
+            appended = pa.table({col: [str(row[i]) for row in rows] for i, col in enumerate(columns)})
+            write_sheet_cache(sheet_name, pa.concat_tables([cached, appended.cast(cached.schema)]), keep_age=True)
+        else:
+            drop_sheet_cache(sheet_name)
+        clear_sheet_cache(sheet_name)
+
+        return True
+    except Exception as e:
+        report_sheet_error(f"Error writing data to sheet '{sheet_name}': {e}", errors)
         return False
 
+def parse_sheet_datetimes(values):
+    """Parses a column of sheet dates to datetime64, trying the fast fixed-format ISO path first."""
+    dates = pd.to_datetime(values, format="%Y-%m-%d", errors='coerce', cache=True)
+
+    # Fall back to format inference only for cells the sheet rendered in another layout
+    unparsed = dates.isna() & (values.astype(str).str.strip() != '') & values.notna()
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(values[unparsed], errors='coerce', cache=True)
+
+    return dates
+
+def parse_sheet_dates(values):
+    """Parses a column of sheet dates to `date` objects."""
+    return parse_sheet_datetimes(values).dt.date
+
 # --- Core Business Logic: Recalculate Summaries ---
 
-def recalculate_all_summaries(initial_balance=2283.22):
+def week_labels(days):
+    """Returns the 'Wk N' ISO-week label for every day of a DatetimeIndex in one vectorized pass."""
+    weeks = days.isocalendar().week.to_numpy(dtype=np.int64)
+    return np.char.add('Wk ', weeks.astype(str)).astype(object)
+
+BALANCE_COLUMNS = ['Start Bal.', 'Target P&L', 'Actual P&L', 'Deposit/Bonus', 'End Bal.']
+
+def roll_balances(initial_balance, pnls, deposits):
+    """
+    Returns the start, end and target balances of consecutive days.
+    Each day starts where the previous one ended, so the whole pass is one in-place cumulative sum.
+    """
+    end_balances = np.add(pnls, deposits)
+    np.cumsum(end_balances, out=end_balances)
+    end_balances += initial_balance
+
+    start_balances = np.empty_like(end_balances)
+    start_balances[:1] = initial_balance
+    start_balances[1:] = end_balances[:-1]
+
+    target_pls = start_balances * DAILY_TARGET_RATE
+    target_pls[start_balances <= 0] = 0.0
+    return start_balances, end_balances, target_pls
+
+def recompute_balances(df_summary, initial_balance):
+    """Rebuilds Start Bal., Target P&L and End Bal. from the daily P&L and deposits."""
+    actual_pl = df_summary['Actual P&L'].to_numpy(dtype=np.float64)
+    deposits = df_summary['Deposit/Bonus'].to_numpy(dtype=np.float64)
+    start_balances, end_balances, target_pls = roll_balances(initial_balance, actual_pl, deposits)
+
+    balances = np.column_stack((start_balances, target_pls, actual_pl, deposits, end_balances)).round(2)
+    df_summary[BALANCE_COLUMNS] = balances
+    return df_summary
+
+def summary_fingerprint(df_trades, deposits, initial_balance):
+    """
+    Stable fingerprint of everything the daily summary is derived from, including today's date for its
+    trailing row. Raw sheet values and prepared frames of the same trades give the same fingerprint.
+    A mismatch rebuilds the summary from these inputs alone, so every row recalculate_all_summaries
+    emits must come from them; a row patched into the sheet from anything else is dropped by that rebuild.
+    """
+    trades_hash = 0
+    if not df_trades.empty and {'trade_date', 'pnl'} <= set(df_trades.columns):
+        trade_key = pd.DataFrame({
+            'day': parse_sheet_datetimes(df_trades['trade_date']).dt.floor('D'),
+            'pnl': pd.to_numeric(df_trades['pnl'], errors='coerce').fillna(0).astype(np.float64),
+        })
+        trades_hash = int(pd.util.hash_pandas_object(trade_key, index=False).sum())
+    # Days without a deposit may or may not be in the map, so only non-zero amounts count
+    deposit_items = sorted((str(day), round(float(amount), 2)) for day, amount in deposits.items() if round(float(amount), 2))
+    today_date_str = datetime.now(CENTRAL_TZ).date().isoformat()
+    payload = repr((trades_hash, deposit_items, round(float(initial_balance), 2), today_date_str))
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+def recalculate_all_summaries(initial_balance=2283.22, deposits=None, previous=None, since_date=None, df_trades=None, errors=None):
     """
     Reads the full trade history, recalculates daily summaries, and updates the sheet.
     This function is run after every trade or deposit entry.
+    `deposits` maps 'YYYY-MM-DD' to the Deposit/Bonus for that day and `previous` is the summary
+    currently in the sheet; when the caller doesn't have them, they are read from daily_summary.
+    `df_trades` is the trade history the caller already loaded; it is only fetched when missing.
+    With `since_date`, rows of `previous` before that day are kept and only the rest is rebuilt.
+    Off the script thread, pass `errors` to collect failures there; no messages are shown then.
     """
     if not SHEET_ID: return pd.DataFrame()
     
     today_date = datetime.now(CENTRAL_TZ).date()
-    today_date_str = today_date.strftime("%Y-%m-%d")
+    today_date_str = today_date.isoformat()
+    today_week = week_labels(pd.DatetimeIndex([today_date]))[0]
 
-    df_trades = get_data_from_sheet('trades')
-    
-    if df_trades.empty or df_trades.shape[0] == 0:
+    if deposits is None:
+        if df_trades is None:
+            # Both tabs are needed, so fetch them in one values.batchGet round trip
+            df_trades, previous = get_data_from_sheets(('trades', 'daily_summary'))
+        else:
+            previous = get_data_from_sheet('daily_summary')
+        deposits = deposits_by_date(prepare_summary(previous.copy()))
+    elif df_trades is None:
+        df_trades = get_data_from_sheet('trades')
+
+    # Days with a deposit keep their row even without trades, the way the deposit form added it;
+    # like the fingerprint, only non-zero amounts count
+    deposit_days = pd.to_datetime(
+        pd.Series([day for day, amount in deposits.items() if round(float(amount), 2)], dtype=object),
+        format="%Y-%m-%d", errors='coerce'
+    ).dropna()
+
+    if df_trades.empty and not deposit_days.empty:
+        # Only deposits to lay out; an empty trades tab has no columns to parse below
+        df_trades = pd.DataFrame({'trade_date': pd.Series(dtype=object), 'pnl': pd.Series(dtype=np.float64)})
+    elif df_trades.empty:
         summary_data = {
             'Date': [today_date_str],
-            'Week': [f'Wk {today_date.isocalendar()[1]}'],
+            'Week': [today_week],
             'Trades': [0],
             'Start Bal.': [initial_balance],
-            'Target P&L': [initial_balance * 0.04],
+            'Target P&L': [round(initial_balance * DAILY_TARGET_RATE, 2)],
             'Actual P&L': [0.0],
             'Deposit/Bonus': [0.0],
             'End Bal.': [initial_balance],
         }
         df_summary = pd.DataFrame(summary_data)
-        write_data_to_sheet('daily_summary', df_summary, mode='replace')
+        df_summary.attrs['fingerprint'] = summary_fingerprint(df_trades, deposits, initial_balance)
+        write_data_to_sheet('daily_summary', df_summary, mode='replace', previous=previous, errors=errors)
         return df_summary
 
     try:
-        df_trades['trade_date'] = pd.to_datetime(df_trades['trade_date'], errors='coerce').dt.date.fillna(pd.NaT).ffill()
-        df_trades['pnl'] = pd.to_numeric(df_trades['pnl'], errors='coerce').fillna(0)
+        # Stay in datetime64 day buckets; rows whose date can't be parsed are left out
+        trade_days = parse_sheet_datetimes(df_trades['trade_date']).dt.floor('D')
+        trade_pnl = pd.to_numeric(df_trades['pnl'], errors='coerce').fillna(0)
     except Exception as e:
-        st.error(f"Error processing trade data types: {e}.")
+        report_sheet_error(f"Error processing trade data types: {e}.", errors)
         return pd.DataFrame()
 
-    df_trades = df_trades.sort_values(by='trade_date')
-    daily_groups = df_trades.groupby('trade_date')
-
-    daily_summary_list = []
-    current_balance = initial_balance
-    
-    for date, group in daily_groups:
-        total_pl = group['pnl'].sum()
-        num_trades = group.shape[0]
-        
-        start_balance = current_balance
-        end_balance = start_balance + total_pl
-        target_pl = start_balance * 0.04
-        if start_balance <= 0: target_pl = 0
-        
-        week_num = datetime.combine(date, datetime.min.time()).isocalendar()[1]
-             
-        daily_summary_list.append({
-            'Date': date.strftime("%Y-%m-%d"),
-            'Week': f'Wk {week_num}',
-            'Trades': num_trades,
-            'Start Bal.': round(start_balance, 2),
-            'Target P&L': round(target_pl, 2),
-            'Actual P&L': round(total_pl, 2),
-            'Deposit/Bonus': 0.00,
-            'End Bal.': round(end_balance, 2),
-        })
-        current_balance = end_balance 
-
-    df_summary = pd.DataFrame(daily_summary_list)
-    df_summary['Date'] = df_summary['Date'].astype(str)
-    
-    df_old_summary = get_data_from_sheet('daily_summary')
-    if not df_old_summary.empty:
-        df_old_summary['Date'] = pd.to_datetime(df_old_summary['Date'], errors='coerce').dt.date.astype(str)
-        df_summary['Date'] = pd.to_datetime(df_summary['Date'], errors='coerce').dt.date.astype(str)
-        
-        df_merged = pd.merge(df_summary, df_old_summary[['Date', 'Deposit/Bonus']], on='Date', how='left', suffixes=('_new', '_old'))
-        
-        df_merged['Deposit/Bonus'] = pd.to_numeric(df_merged['Deposit/Bonus_old'], errors='coerce').fillna(0.00)
-        
-        df_summary = df_merged[['Date', 'Week', 'Trades', 'Start Bal.', 'Target P&L', 'Actual P&L', 'Deposit/Bonus', 'End Bal.']]
-        
-        current_balance_recalc = initial_balance
-        new_summary_list = []
-        for index, row in df_summary.iterrows():
-            deposit = row['Deposit/Bonus']
-            actual_pl = row['Actual P&L'] 
-            start_balance = current_balance_recalc
-            end_balance = start_balance + actual_pl + deposit 
-            target_pl = start_balance * 0.04
-            if start_balance <= 0:
-                 target_pl = 0
-            
-            new_summary_list.append({
-                'Date': row['Date'],
-                'Week': row['Week'],
-                'Trades': row['Trades'],
-                'Start Bal.': round(start_balance, 2),
-                'Target P&L': round(target_pl, 2),
-                'Actual P&L': round(actual_pl, 2),
-                'Deposit/Bonus': round(deposit, 2),
-                'End Bal.': round(end_balance, 2),
-            })
-            current_balance_recalc = end_balance 
-        
-        df_summary = pd.DataFrame(new_summary_list)
-        df_summary['Date'] = df_summary['Date'].astype(str)
-        
-    if not df_summary.empty:
-        last_recorded_date_str = df_summary['Date'].iloc[-1]
-        
-        if last_recorded_date_str != today_date_str:
-            
-            last_end_bal = df_summary['End Bal.'].iloc[-1]
-            today_start_bal = last_end_bal
-            today_target_pl = today_start_bal * 0.04
-            
-            new_row = pd.DataFrame([{
-                'Date': today_date_str,
-                'Week': f'Wk {today_date.isocalendar()[1]}',
-                'Trades': 0,
-                'Start Bal.': round(today_start_bal, 2),
-                'Target P&L': round(today_target_pl, 2),
-                'Actual P&L': 0.0,
-                'Deposit/Bonus': 0.0,
-                'End Bal.': round(today_start_bal, 2),
-            }])
-            
-            df_summary = pd.concat([df_summary, new_row], ignore_index=True)
+    valid_days = trade_days.notna()
+    start_balance = initial_balance
+    df_head = None
+    if since_date is not None and previous is not None and not previous.empty:
+        # Days before since_date can't change, so keep those rows and continue from their last End Bal.
+        since_day = pd.Timestamp(since_date)
+        previous_days = pd.to_datetime(previous['Date'].astype(str), format="%Y-%m-%d", errors='coerce')
+        head_days = previous_days < since_day
+        # `previous` is in sheet order, so order the kept rows by date before continuing from the last one
+        df_head = previous[head_days.to_numpy()].iloc[np.argsort(previous_days[head_days].to_numpy(), kind='stable')]
+        if not df_head.empty:
+            # Rows read straight from the sheet still hold strings, blank like prepare_summary's 0
+            start_balance = float(pd.to_numeric(df_head['End Bal.'], errors='coerce').fillna(0).iloc[-1])
+        valid_days &= trade_days >= since_day
+        deposit_days = deposit_days[deposit_days >= since_day]
+
+    pnl_by_day = trade_pnl[valid_days].groupby(trade_days[valid_days]).agg(['sum', 'size'])
+    if not deposit_days.empty:
+        pnl_by_day = pnl_by_day.reindex(pnl_by_day.index.union(pd.DatetimeIndex(deposit_days)), fill_value=0)
+
+    # Today always gets a row, so it joins the trading days in the single balance pass below
+    has_head = df_head is not None and not df_head.empty
+    head_has_today = has_head and str(df_head['Date'].iloc[-1]) == today_date_str
+    if (has_head or not pnl_by_day.empty) and not head_has_today:
+        pnl_by_day = pnl_by_day.reindex(pnl_by_day.index.union([pd.Timestamp(today_date)]), fill_value=0)
+    day_index = pd.DatetimeIndex(pnl_by_day.index)
+
+    day_strings = pd.Series(day_index.strftime("%Y-%m-%d"))
+
+    df_summary = pd.DataFrame({
+        'Date': day_strings,
+        'Week': week_labels(day_index),
+        'Trades': pnl_by_day['size'].to_numpy(),
+        'Start Bal.': 0.0,
+        'Target P&L': 0.0,
+        'Actual P&L': pnl_by_day['sum'].to_numpy(),
+        # The deposits map is keyed by the same 'YYYY-MM-DD' strings, so a dict lookup lines them up
+        'Deposit/Bonus': day_strings.map(deposits).astype(np.float64).fillna(0.0),
+        'End Bal.': 0.0,
+    })
+    df_summary = recompute_balances(df_summary, start_balance)
 
+    if has_head:
+        df_head = df_head.reindex(columns=df_summary.columns).astype({'Date': str, 'Week': str})
+        df_summary = pd.concat([df_head, df_summary], ignore_index=True)
 
     if not df_summary.empty:
-        write_data_to_sheet('daily_summary', df_summary, mode='replace')
-        st.toast("✅ Daily summaries recalculated successfully!", icon="✅")
+        df_summary.attrs['fingerprint'] = summary_fingerprint(df_trades, deposits, initial_balance)
+        write_data_to_sheet('daily_summary', df_summary, mode='replace', previous=previous, errors=errors)
+        if errors is None:
+            st.toast("✅ Daily summaries recalculated successfully!", icon="✅")
         
     return df_summary
 
 # --- Data Loading and Caching ---
 
-def load_data():
-    """Load data for the UI."""
-    df_summary = get_data_from_sheet('daily_summary')
-    df_trades = get_data_from_sheet('trades')
-    
+def coerce_numeric(df, fill_values):
+    """
+    Converts the columns named in `fill_values` to float64 in one block cast, filling blanks and
+    unparseable cells with the given value. Only a block with stray text falls back to to_numeric.
+    """
+    columns = [col for col in fill_values if col in df.columns]
+    if not columns: return df
+
+    block = df[columns].replace('', np.nan)
+    try:
+        block = block.astype(np.float64)
+    except (ValueError, TypeError):
+        block = block.apply(pd.to_numeric, errors='coerce')
+    df[columns] = block.fillna({col: fill_values[col] for col in columns})
+    return df
+
+def prepare_summary(df_summary):
+    """Converts raw daily_summary values to the types the UI works with."""
     if not df_summary.empty:
         try:
             if 'Date' in df_summary.columns:
-                df_summary['Date'] = pd.to_datetime(df_summary['Date'], errors='coerce').dt.date
+                df_summary['Date'] = parse_sheet_dates(df_summary['Date'])
             
-            numeric_cols = ['Start Bal.', 'Target P&L', 'Actual P&L', 'Deposit/Bonus', 'End Bal.', 'Trades']
-            for col in numeric_cols:
-                if col in df_summary.columns:
-                     df_summary[col] = pd.to_numeric(df_summary[col], errors='coerce').fillna(0)
+            df_summary = coerce_numeric(df_summary, {'Start Bal.': 0, 'Target P&L': 0, 'Actual P&L': 0, 'Deposit/Bonus': 0, 'End Bal.': 0, 'Trades': 0})
+            if 'Trades' in df_summary.columns:
+                df_summary['Trades'] = df_summary['Trades'].astype(np.int64)
+
+            # Week labels repeat across many days, so store them as category codes
+            if 'Week' in df_summary.columns:
+                df_summary['Week'] = df_summary['Week'].astype('category')
             
             df_summary = df_summary.sort_values(by='Date')
 
@@ -633,67 +650,312 @@ def load_data():
             st.warning(f"Could not convert summary data types: {e}")
             df_summary = pd.DataFrame()
 
+    return df_summary
+
+def prepare_trades(df_trades):
+    """Converts raw trades values to the types the UI works with."""
     if not df_trades.empty:
         try:
+            # Trade days stay datetime64 so filtering and grouping run vectorized; dates are only formatted for display
             if 'trade_date' in df_trades.columns:
-                df_trades['trade_date'] = pd.to_datetime(df_trades['trade_date'], errors='coerce').dt.date
-            if 'pnl' in df_trades.columns:
-                df_trades['pnl'] = pd.to_numeric(df_trades['pnl'], errors='coerce').fillna(0)
-            if 'pnl_pct' in df_trades.columns:
-                df_trades['pnl_pct'] = pd.to_numeric(df_trades['pnl_pct'], errors='coerce').fillna(0)
-            if 'leverage' in df_trades.columns:
-                df_trades['leverage'] = pd.to_numeric(df_trades['leverage'], errors='coerce').fillna(1.0)
-            if 'investment' in df_trades.columns:
-                df_trades['investment'] = pd.to_numeric(df_trades['investment'], errors='coerce').fillna(0)
+                df_trades['trade_date'] = parse_sheet_datetimes(df_trades['trade_date']).dt.normalize()
+                # Stable, so each day keeps its entry order; date ranges can then be cut with searchsorted
+                df_trades = df_trades.sort_values('trade_date', kind='stable')
+            df_trades = coerce_numeric(df_trades, {'pnl': 0, 'pnl_pct': 0, 'leverage': 1.0, 'investment': 0})
+            for col in ('ticker', 'direction'):
+                if col in df_trades.columns:
+                    df_trades[col] = df_trades[col].astype('category')
 
         except Exception as e:
             st.warning(f"Could not convert trades data types: {e}")
             df_trades = pd.DataFrame()
-            
-    return df_summary, df_trades
+
+    return df_trades
+
+def append_prepared_trades(df_trades, new_trades):
+    """Appends a list of trade dicts to prepared trades, keeping ticker and direction categorical."""
+    combined = pd.concat([df_trades, prepare_trades(pd.DataFrame(new_trades))], ignore_index=True)
+    # Concatenating categoricals with different categories falls back to object, so re-encode
+    for col in ('ticker', 'direction'):
+        if col in combined.columns:
+            combined[col] = combined[col].astype('category')
+    return combined
+
+def sorted_labels(column):
+    """Sorted distinct values of a label column, read off its categories when it is categorical."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return sorted(column.cat.categories)
+    return sorted(column.dropna().unique())
+
+def deposits_by_date(df_summary):
+    """Maps each date of a prepared summary, as 'YYYY-MM-DD', to its Deposit/Bonus amount."""
+    if df_summary.empty or 'Deposit/Bonus' not in df_summary.columns:
+        return {}
+    return dict(zip(df_summary['Date'].astype(str), df_summary['Deposit/Bonus'].astype(float)))
+
+@st.cache_resource
+def get_sheet_write_executor():
+    """
+    One writer thread for the whole process instead of one per session. It runs jobs in submission
+    order, so each session's writes still land in order, and sessions don't leave idle threads behind.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheet-writer")
+
+def _run_sheet_job(jobs, results):
+    """
+    Applies the oldest queued sheet job of a session on the writer thread.
+    Jobs are ('append' | 'replace', sheet_name, df), ('append_rows', sheet_name, columns, rows)
+    or ('recalculate', initial_balance, deposits, since_date, df_trades);
+    a recalculated summary and any failures are left in `results` for the next rerun to pick up,
+    since the run that queued the job may be long finished.
+    Replacing a sheet diffs against results['sheets'], the rows it was last read or written with;
+    after a failed write the sheet's contents are unknown, so its next replace rewrites it whole.
+    """
+    job = jobs.get_nowait()
+    errors = []
+    sheets = results['sheets']
+    try:
+        if job[0] == 'recalculate':
+            initial_balance, deposits, since_date, df_trades = job[1:]
+            df_summary = recalculate_all_summaries(
+                initial_balance, deposits, sheets.get('daily_summary'), since_date, df_trades, errors=errors
+            )
+            if not df_summary.empty:
+                results['df_summary'] = df_summary
+                sheets['daily_summary'] = None if errors else df_summary
+        elif job[0] == 'append_rows':
+            if not append_rows_to_sheet(*job[1:], errors=errors) and not errors:
+                errors.append(f"Failed to write to '{job[1]}'.")
+        elif write_data_to_sheet(job[1], job[2], mode=job[0], previous=sheets.get(job[1]), errors=errors):
+            sheets[job[1]] = job[2] if job[0] == 'replace' else None
+        else:
+            sheets[job[1]] = None
+            if not errors:
+                errors.append(f"Failed to write to '{job[1]}'.")
+    except Exception as e:
+        errors.append(str(e))
+    finally:
+        results['errors'].extend(errors)
+        jobs.task_done()
+
+def start_sheet_writer():
+    """Sets up this session's job queue and results once, so sheet writes don't block the rerun."""
+    if 'write_queue' in st.session_state:
+        return
+    st.session_state.write_queue = queue.Queue()
+    st.session_state.write_results = {'errors': [], 'sheets': {}}
+
+def queue_sheet_write(*job):
+    """Queues a sheet job behind this session's earlier ones and hands it to the shared writer thread."""
+    st.session_state.write_queue.put(job)
+    get_sheet_write_executor().submit(_run_sheet_job, st.session_state.write_queue, st.session_state.write_results)
+
+def apply_sheet_writes(wait=False):
+    """Moves results of finished background jobs into session state; with wait=True, drains the queue first."""
+    if wait:
+        st.session_state.write_queue.join()
+    write_results = st.session_state.write_results
+    if 'df_summary' in write_results:
+        # The writer thread leaves the summary as written; typing it and the message happen on this run
+        st.session_state.df_summary = prepare_summary(write_results.pop('df_summary').copy())
+        st.toast("✅ Daily summaries recalculated successfully!", icon="✅")
+    while write_results['errors']:
+        st.error(f"❌ Background sync failed: {write_results['errors'].pop(0)}")
+
+def append_trades_batch(trades):
+    """
+    Queues a batch of trade dicts as one append_rows write, followed by a single summary rebuild.
+    Only summary rows from the earliest trade date in the batch onward can change.
+    """
+    columns = list(trades[0])
+    rows = [[trade[col] for col in columns] for trade in trades]
+    queue_sheet_write('append_rows', 'trades', columns, rows)
+    # The session trades already include the batch, so the rebuild doesn't read the trades sheet back
+    queue_sheet_write(
+        'recalculate', st.session_state.initial_balance, dict(st.session_state.deposits),
+        min(trade['trade_date'] for trade in trades), st.session_state.df_trades
+    )
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_data():
+    """
+    Load data for the UI. Cached so the date and numeric coercion only reruns when the sheets do.
+    Returns the summary rows as read, in sheet order, for diffing writes against, then the prepared summary and trades.
+    """
+    df_summary, df_trades = get_data_from_sheets(('daily_summary', 'trades'))
+    return df_summary, prepare_summary(df_summary.copy()), prepare_trades(df_trades)
+
+def mark_data_dirty():
+    """Flags the in-memory copies of both sheets as stale so the next run reloads them."""
+    st.session_state.data_dirty = True
+
+def calculate_quick_stats(df_summary, total_trades, initial_balance):
+    """Computes the sidebar Quick Stats with NumPy reductions over the summary columns."""
+    stats = {
+        'current_balance': initial_balance,
+        'total_trades': total_trades,
+        'latest_week': 'Wk 1',
+        'total_pl': 0.0,
+    }
+
+    if not df_summary.empty:
+        stats['current_balance'] = float(df_summary['End Bal.'].to_numpy(dtype=np.float64)[-1])
+        stats['latest_week'] = df_summary['Week'].iloc[-1]
+        stats['total_pl'] = float(df_summary['Actual P&L'].to_numpy(dtype=np.float64).sum())
+
+    # Today's summary row, looked up once here instead of scanning the summary on every Tab 1 render;
+    # without a Date column no row can be today's
+    stats['today_row'] = None
+    if 'Date' in df_summary.columns:
+        today_rows = df_summary[df_summary['Date'] == datetime.now(CENTRAL_TZ).date()]
+        if not today_rows.empty:
+            stats['today_row'] = today_rows.iloc[0].to_dict()
+
+    stats['balance_delta'] = stats['current_balance'] - initial_balance
+    stats['total_pl_percent'] = (stats['total_pl'] / initial_balance) * 100 if initial_balance > 0 else 0
+    return stats
+
+def get_quick_stats():
+    """
+    Returns the Quick Stats stored next to the session frames.
+    Writes replace the frames rather than mutate them, so the stats are only recomputed
+    when either frame is a different object than last time, or the initial balance or day changed.
+    """
+    df_summary = st.session_state.df_summary
+    df_trades = st.session_state.df_trades
+    inputs = (st.session_state.initial_balance, datetime.now(CENTRAL_TZ).date())
+
+    stored = st.session_state.get('quick_stats')
+    if stored is None or stored[0] is not df_summary or stored[1] is not df_trades or stored[2] != inputs:
+        stats = calculate_quick_stats(df_summary, len(df_trades), inputs[0])
+        stored = (df_summary, df_trades, inputs, stats)
+        st.session_state.quick_stats = stored
+    return stored[3]
+
+def get_trades_by_date():
+    """
+    Returns the session trades split by trade day as {Timestamp: frame}.
+    Like the Quick Stats, the split is only redone when the trades frame is replaced.
+    """
+    df_trades = st.session_state.df_trades
+    stored = st.session_state.get('trades_by_date')
+    if stored is None or stored[0] is not df_trades:
+        stored = (df_trades, dict(tuple(df_trades.groupby('trade_date', sort=True))))
+        st.session_state.trades_by_date = stored
+    return stored[1]
+
+def get_date_bounds():
+    """
+    Returns the first and last day across the summary and the trades, for the analytics date pickers.
+    Memoized on the two session frames, so it is only recomputed after a load or a write.
+    """
+    df_summary = st.session_state.df_summary
+    df_trades = st.session_state.df_trades
+    stored = st.session_state.get('date_bounds')
+    if stored is None or stored[0] is not df_summary or stored[1] is not df_trades:
+        days = pd.to_datetime([
+            day for day in (
+                df_summary['Date'].min(), df_summary['Date'].max(),
+                df_trades['trade_date'].min(), df_trades['trade_date'].max(),
+            ) if pd.notna(day)
+        ])
+        stored = (df_summary, df_trades, (days.min().date(), days.max().date()))
+        st.session_state.date_bounds = stored
+    return stored[2]
 
 # --- Initialize App and State ---
 
 if 'initial_balance' not in st.session_state:
     st.session_state.initial_balance = 1918.91 #2272.22 
 
-df_summary_temp, df_trades_temp = load_data() 
-if not df_summary_temp.empty and 'Start Bal.' in df_summary_temp.columns:
-    st.session_state.initial_balance = df_summary_temp['Start Bal.'].iloc[0]
-    
-recalculate_all_summaries(st.session_state.initial_balance)
-df_summary, df_trades = load_data()
+# Submitted trades wait here until they are committed to the sheet in one append
+if 'pending_trades' not in st.session_state:
+    st.session_state.pending_trades = []
+
+start_sheet_writer()
+
+# Sheets are read once per session and again only after mark_data_dirty(); writes below
+# update these copies in place, so the rerun after a submission doesn't fetch both sheets again.
+if st.session_state.get('data_dirty', True):
+    st.session_state.write_queue.join()
+    df_summary_sheet, df_summary_temp, df_trades_temp = load_data()
+    if not df_summary_temp.empty and 'Start Bal.' in df_summary_temp.columns:
+        st.session_state.initial_balance = df_summary_temp['Start Bal.'].iloc[0]
+
+    # Deposits only change through the deposit form, so later recalculations reuse this map
+    st.session_state.deposits = deposits_by_date(df_summary_temp)
+
+    # The sheet keeps the fingerprint of the inputs its summary was built from; with the same
+    # trades, deposits and day (e.g. a new session or Refresh Data) there is nothing to recalculate.
+    # A blank or stale one (the deposit form blanks it) means a rebuild from those inputs, which is
+    # only safe while they cover every row the rebuild emits (see summary_fingerprint)
+    fingerprint = summary_fingerprint(df_trades_temp, st.session_state.deposits, st.session_state.initial_balance)
+    if df_summary_temp.empty or df_summary_temp.attrs.get('fingerprint') != fingerprint:
+        # The recalculated summary is what was just written, so use it instead of reading the sheet back
+        sheet_errors = []
+        df_recalculated = recalculate_all_summaries(
+            st.session_state.initial_balance, st.session_state.deposits,
+            previous=df_summary_sheet, df_trades=df_trades_temp, errors=sheet_errors
+        )
+        for message in sheet_errors:
+            st.error(message)
+        if not df_recalculated.empty:
+            df_summary_temp = prepare_summary(df_recalculated.copy())
+            df_summary_sheet = None if sheet_errors else df_recalculated
+            if not sheet_errors:
+                st.toast("✅ Daily summaries recalculated successfully!", icon="✅")
+    # Later writes from this session diff against the rows the sheet holds, not the sorted frame
+    st.session_state.write_results['sheets'] = {'daily_summary': df_summary_sheet}
+    st.session_state.df_summary, st.session_state.df_trades = df_summary_temp, df_trades_temp
+    if st.session_state.pending_trades:
+        st.session_state.df_trades = append_prepared_trades(
+            st.session_state.df_trades, st.session_state.pending_trades
+        )
+    st.session_state.data_dirty = False
+
+# Pick up whatever the background writer finished since the last run
+apply_sheet_writes()
+
+df_summary = st.session_state.df_summary
+df_trades = st.session_state.df_trades
 
 
 # --- Sidebar: Quick Stats ---
 
-with st.sidebar:
-    st.markdown("### 📊 Quick Stats")
-    
-    current_balance = df_summary['End Bal.'].iloc[-1] if not df_summary.empty else st.session_state.initial_balance
-    
-    
+@st.fragment
+def render_quick_stats():
+    """Sidebar metrics, rerun on their own without re-rendering the tabs."""
+    quick_stats = get_quick_stats()
     st.metric(
         label="💰 Current Balance",
-        value=f"${current_balance:,.2f}",
-        delta=f"${current_balance - st.session_state.initial_balance:,.2f}",
+        value=f"${quick_stats['current_balance']:,.2f}",
+        delta=f"${quick_stats['balance_delta']:,.2f}",
         delta_color="normal"
     )
 
-    total_trades = df_trades.shape[0] if not df_trades.empty else 0
-    st.metric(label="🔄 Total Trades", value=total_trades)
-    
-    latest_week = df_summary['Week'].iloc[-1] if not df_summary.empty else 'Wk 1'
-    st.metric(label="📅 Current Week", value=latest_week)
+    st.metric(label="🔄 Total Trades", value=quick_stats['total_trades'])
+
+    st.metric(label="📅 Current Week", value=quick_stats['latest_week'])
 
-    total_pl = df_summary['Actual P&L'].sum() if not df_summary.empty else 0.0
-    total_pl_percent = (total_pl / st.session_state.initial_balance) * 100 if st.session_state.initial_balance > 0 else 0
     st.metric(
         label="📈 Total Trading P&L",
-        value=f"${total_pl:,.2f}",
-        delta=f"{total_pl_percent:.2f}%",
+        value=f"${quick_stats['total_pl']:,.2f}",
+        delta=f"{quick_stats['total_pl_percent']:.2f}%",
         delta_color="normal"
     )
+
+    pending_writes = st.session_state.write_queue.unfinished_tasks
+    if pending_writes:
+        st.caption(f"🔄 Syncing {pending_writes} change(s) to Google Sheets…")
+
+with st.sidebar:
+    st.markdown("### 📊 Quick Stats")
+    render_quick_stats()
+
+    if st.button("🔄 Refresh Data", use_container_width=True, help="Reload trades and summaries from Google Sheets"):
+        clear_sheet_cache(local=True)
+        mark_data_dirty()
+        st.rerun()
     
     st.divider()
     
@@ -717,26 +979,26 @@ with st.sidebar:
         
         if reset_button and reset_confirmation == "DELETE":
             try:
-                gc = connect_gsheets()
-                if gc:
-                    spreadsheet = gc.open_by_key(SHEET_ID)
-                    
-                    trades_sheet = spreadsheet.worksheet('trades')
-                    trades_sheet.clear()
-                    trades_sheet.update('A1', [['trade_date', 'ticker', 'leverage', 'direction', 'investment', 'pnl', 'pnl_pct']])
-                    
-                    summary_sheet = spreadsheet.worksheet('daily_summary')
-                    summary_sheet.clear()
-                    summary_sheet.update('A1', [['Date', 'Week', 'Trades', 'Start Bal.', 'Target P&L', 'Actual P&L', 'Deposit/Bonus', 'End Bal.']])
+                spreadsheet = get_spreadsheet()
+                if spreadsheet:
+                    # Both sheets are cleared in one request and get their headers back in another
+                    spreadsheet.values_batch_clear(body={'ranges': ["'trades'!A:Z", "'daily_summary'!A:Z"]})
+                    spreadsheet.values_batch_update({
+                        'valueInputOption': 'USER_ENTERED',
+                        'data': [
+                            {'range': "'trades'!A1", 'values': [['trade_date', 'ticker', 'leverage', 'direction', 'investment', 'pnl', 'pnl_pct']]},
+                            {'range': "'daily_summary'!A1", 'values': [['Date', 'Week', 'Trades', 'Start Bal.', 'Target P&L', 'Actual P&L', 'Deposit/Bonus', 'End Bal.']]},
+                        ],
+                    })
                     
+                    clear_sheet_cache(local=True)
                     st.cache_data.clear()
-                    st.cache_resource.clear()
+                    # Worksheet handles are only re-resolved after a reset; the client connection stays
+                    get_worksheet.clear()
+                    mark_data_dirty()
                     
-                    st.success("✅ All data has been deleted successfully!")
-                    st.balloons()
-                    
-                    import time
-                    time.sleep(1)
+                    # A toast outlives the rerun, so there's no need to pause for the message
+                    st.toast("✅ All data has been deleted successfully!", icon="✅")
                     st.rerun()
                 else:
                     st.error("❌ Failed to connect to Google Sheets")
@@ -767,11 +1029,11 @@ with tab1:
     
     today_date_obj = datetime.now(CENTRAL_TZ).date()
 
-    df_today = df_summary[df_summary['Date'] == today_date_obj]
+    today_row = get_quick_stats()['today_row']
     
-    if not df_today.empty:
-        today_target_pl = df_today['Target P&L'].iloc[0]
-        today_actual_pl = df_today['Actual P&L'].iloc[0]
+    if today_row is not None:
+        today_target_pl = today_row['Target P&L']
+        today_actual_pl = today_row['Actual P&L']
         
         if today_target_pl > 0:
             
@@ -824,7 +1086,7 @@ with tab1:
     st.subheader("📆 Weekly Performance")
 
     # list weeks available
-    available_weeks = sorted(df_summary['Week'].unique())
+    available_weeks = sorted_labels(df_summary['Week'])
 
     # default to the latest week
     default_week = df_summary['Week'].iloc[-1] if not df_summary.empty else None
@@ -897,21 +1159,33 @@ with tab1:
             elif investment <= 0:
                 st.error("❌ Investment must be greater than zero.")
             else:
-                new_trade_data = pd.DataFrame([{
-                    'trade_date': trade_date.strftime("%Y-%m-%d"),
+                new_trade = {
+                    'trade_date': trade_date.isoformat(),
                     'ticker': ticker.upper(),
                     'leverage': leverage,
                     'direction': direction,
                     'investment': investment,
                     'pnl': pnl,
                     'pnl_pct': pnl_pct,
-                }])
+                }
                 
-                if write_data_to_sheet('trades', new_trade_data, mode='append'):
-                    st.success("✅ Trade successfully logged!")
-                    st.rerun()
-                else:
-                    st.error("❌ Failed to log trade to Google Sheet.")
+                # Queue the trade and patch the session copy; the sheet is written on commit
+                st.session_state.pending_trades.append(new_trade)
+                st.session_state.df_trades = append_prepared_trades(df_trades, [new_trade])
+                st.rerun()
+
+    pending_trades = st.session_state.pending_trades
+    with st.expander(f"🕒 Pending Trades ({len(pending_trades)})", expanded=bool(pending_trades)):
+        if pending_trades:
+            st.dataframe(pd.DataFrame(pending_trades), use_container_width=True, hide_index=True)
+            st.caption("Pending trades are kept for this session only until they are committed.")
+            
+            if st.button("💾 Commit to sheet", type="primary", use_container_width=True):
+                append_trades_batch(pending_trades)
+                st.session_state.pending_trades = []
+                st.rerun()
+        else:
+            st.caption("Submitted trades are queued here and written to the sheet together.")
 
 # --- Deposit / Bonus Entry ---
 with st.expander("💵 Add Deposit or Bonus", expanded=False):
@@ -931,31 +1205,35 @@ with st.expander("💵 Add Deposit or Bonus", expanded=False):
                 st.error("⚠️ Deposit amount must be greater than zero.")
             else:
                 try:
-                    df_summary_latest = get_data_from_sheet("daily_summary")
+                    # Let queued writes land first so the session summary mirrors the sheet
+                    apply_sheet_writes(wait=True)
+                    df_summary_latest = st.session_state.df_summary.reset_index(drop=True)
+                    # The patched summary no longer matches the stored fingerprint's inputs, so the write blanks it
+                    df_summary_latest.attrs.pop('fingerprint', None)
 
                     if df_summary_latest.empty:
                         st.error("⚠️ No summary found. Please record at least one trade before adding deposits.")
                     else:
-                        # Convert date formats for comparison
-                        df_summary_latest["Date"] = pd.to_datetime(df_summary_latest["Date"], errors="coerce").dt.date
-                        
                         # Ensure Deposit/Bonus column exists and is numeric
                         if "Deposit/Bonus" not in df_summary_latest.columns:
                             df_summary_latest["Deposit/Bonus"] = 0.0
                         
                         df_summary_latest["Deposit/Bonus"] = pd.to_numeric(df_summary_latest["Deposit/Bonus"], errors='coerce').fillna(0.0)
 
-                        if deposit_date in df_summary_latest["Date"].values:
+                        # One pass over the dates answers both "is the day there" and "which row"
+                        date_to_idx = dict(zip(df_summary_latest["Date"], df_summary_latest.index))
+                        idx = date_to_idx.get(deposit_date)
+                        if idx is not None:
                             # Update existing deposit value for the day
-                            idx = df_summary_latest[df_summary_latest["Date"] == deposit_date].index[0]
                             prev_value = float(df_summary_latest.at[idx, "Deposit/Bonus"])
-                            df_summary_latest.at[idx, "Deposit/Bonus"] = prev_value + float(deposit_amount)
-                            st.success(f"💰 Added ${deposit_amount:,.2f} to {deposit_date}.")
+                            new_deposit_total = prev_value + float(deposit_amount)
+                            df_summary_latest.at[idx, "Deposit/Bonus"] = new_deposit_total
+                            deposit_message = f"💰 Added ${deposit_amount:,.2f} to {deposit_date}."
                         else:
                             # If date missing (e.g., future day) — add new row
                             new_row = {
                                 "Date": deposit_date,
-                                "Week": f"Wk {deposit_date.isocalendar()[1]}",
+                                "Week": week_labels(pd.DatetimeIndex([deposit_date]))[0],
                                 "Trades": 0,
                                 "Start Bal.": 0.0,
                                 "Target P&L": 0.0,
@@ -963,28 +1241,32 @@ with st.expander("💵 Add Deposit or Bonus", expanded=False):
                                 "Deposit/Bonus": float(deposit_amount),
                                 "End Bal.": 0.0,
                             }
-                            df_summary_latest = pd.concat([df_summary_latest, pd.DataFrame([new_row])], ignore_index=True)
+                            new_deposit_total = float(deposit_amount)
+                            if isinstance(df_summary_latest["Week"].dtype, pd.CategoricalDtype) and new_row["Week"] not in df_summary_latest["Week"].cat.categories:
+                                df_summary_latest["Week"] = df_summary_latest["Week"].cat.add_categories([new_row["Week"]])
+                            # Enlarge in place on the fresh RangeIndex instead of concatenating a one-row frame
+                            df_summary_latest.loc[len(df_summary_latest)] = new_row
                             # Sort by date to maintain chronological order
-                            df_summary_latest["Date"] = pd.to_datetime(df_summary_latest["Date"], errors="coerce").dt.date
-                            df_summary_latest = df_summary_latest.sort_values('Date').reset_index(drop=True)
-                            st.info(f"🆕 Created new entry for {deposit_date} with ${deposit_amount:,.2f} deposit.")
-
-                        # Convert Date back to string format for Google Sheets
-                        df_summary_latest["Date"] = df_summary_latest["Date"].astype(str)
-                        
-                        # Write back to sheet
-                        success = write_data_to_sheet("daily_summary", df_summary_latest, mode="replace")
-                        if success:
-                            # Clear cache and recalculate everything
-                            get_data_from_sheet.clear()
-                            recalculate_all_summaries(st.session_state.initial_balance)
-                            st.success("✅ Deposit recorded and balances updated!")
-                            st.balloons()
-                            import time
-                            time.sleep(0.5)  # Brief pause before rerun
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to update deposit in Google Sheet.")
+                            df_summary_latest = df_summary_latest.sort_values('Date')
+                            deposit_message = f"🆕 Created new entry for {deposit_date} with ${deposit_amount:,.2f} deposit."
+
+                        # A deposit only shifts the balances from its day on, so patch them locally
+                        # instead of rebuilding the summary from the trades sheet
+                        df_summary_latest = recompute_balances(
+                            df_summary_latest.reset_index(drop=True), st.session_state.initial_balance
+                        )
+                        st.session_state.deposits[str(deposit_date)] = new_deposit_total
+                        st.session_state.df_summary = df_summary_latest
+
+                        # One batch update with just the rows that changed, sent from the writer thread
+                        queue_sheet_write(
+                            "replace", "daily_summary",
+                            df_summary_latest.assign(Date=df_summary_latest["Date"].astype(str))
+                        )
+                        # Toasts outlive the rerun, so the form returns without pausing on a message
+                        st.toast(deposit_message)
+                        st.toast("✅ Deposit recorded and balances updated!", icon="✅")
+                        st.rerun()
                             
                 except Exception as e:
                     st.error(f"❌ Error processing deposit: {str(e)}")
@@ -1044,8 +1326,302 @@ with st.expander("💵 Add Deposit or Bonus", expanded=False):
 #                     st.error("❌ Failed to update deposit in Google Sheet.")
 
 
+# --- Chart Builders ---
+# Figures are cached on the content of the data they plot, so reruns with unchanged data
+# (switching tabs, unrelated widgets) skip rebuilding the Plotly objects.
+
+@st.cache_data(show_spinner=False)
+def build_balance_fig(df_chart):
+    """Balance Progression chart from the date-sorted summary."""
+    # Long histories render through WebGL; Scattergl has no spline shape, so smooth only the SVG version
+    use_webgl = len(df_chart) > WEBGL_POINT_THRESHOLD
+    balance_trace = go.Scattergl if use_webgl else go.Scatter
+
+    # Shared by all three traces
+    x_dates = df_chart['Date'].astype(str).to_numpy()
+    target_end = (df_chart['Start Bal.'] + df_chart['Target P&L']).to_numpy()
+
+    fig = go.Figure()
+    
+    fig.add_trace(balance_trace(
+        x=x_dates,
+        y=df_chart['End Bal.'],
+        mode='lines+markers',
+        name='End Balance',
+        line=dict(color='#00ff88', width=3, shape='linear' if use_webgl else 'spline'),
+        marker=dict(size=8, color='#00d97e', line=dict(color='#0a0e0f', width=2)),
+        fill='tozeroy',
+        fillcolor='rgba(0, 255, 136, 0.1)'
+    ))
+    
+    fig.add_trace(balance_trace(
+        x=x_dates,
+        y=df_chart['Start Bal.'],
+        mode='lines+markers',
+        name='Start Balance',
+        line=dict(color='#fbbf24', width=2, dash='dot'), 
+        marker=dict(size=6, color='#fbbf24')
+    ))
+
+    fig.add_trace(balance_trace(
+        x=x_dates,
+        y=target_end,
+        mode='lines',
+        name='Target End Bal',
+        line=dict(color='#34d399', width=2, dash='dash')
+    ))
+    
+    if not df_chart.empty:
+        min_bal = df_chart[['End Bal.', 'Start Bal.']].min().min()
+        max_bal = df_chart[['End Bal.', 'Start Bal.']].max().max()
+        padding = (max_bal - min_bal) * 0.1 
+        y_range = [max(0, min_bal - padding), max_bal + padding]
+    else:
+        y_range = [0, 100]
+
+    fig.update_layout(
+        # Every style below is set explicitly, so skip shipping the default template JSON on each rerun
+        template='none',
+        title='Balance Progression Over Time',
+        xaxis_title="Date",
+        yaxis_title="Balance ($)",
+        hovermode='x unified',
+        height=450,
+        plot_bgcolor='#0f1419', 
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Inter, sans-serif", size=12, color="#e8f5e9"),
+        title_font=dict(size=20, color='#00ff88', family="Inter"),
+        legend=dict(
+            orientation="h", 
+            yanchor="bottom", y=1.02, xanchor="right", x=1, 
+            bgcolor='rgba(0,0,0,0)',
+            font=dict(color="#e8f5e9")
+        ),
+        xaxis=dict(
+            showgrid=True, 
+            gridcolor='rgba(0, 255, 136, 0.1)',
+            tickfont=dict(color='#e8f5e9'),
+            tickformat="%b %d<br>%Y",
+            dtick='d' 
+        ),
+        yaxis=dict(
+            showgrid=True, 
+            gridcolor='rgba(0, 255, 136, 0.1)',
+            tickfont=dict(color='#e8f5e9'),
+            autorange=False, 
+            range=y_range 
+        ),
+        margin=dict(t=50) 
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_pnl_fig(df_chart):
+    """Daily P&L bars for the (already windowed) filtered summary."""
+    # Colors for bars
+    colors = np.where(df_chart['Actual P&L'].to_numpy() > 0, '#00ff88', '#ff4757')
+
+    fig_pnl = go.Figure()
+    fig_pnl.add_trace(go.Bar(
+        x=df_chart['Date'].astype(str),
+        y=df_chart['Actual P&L'],
+        marker_color=colors,
+        # The browser formats the labels from y, so no per-row Python string building
+        texttemplate='$%{y:,.2f}',
+        textposition='auto'
+    ))
+
+    fig_pnl.update_layout(
+        title=f"Daily P&L (Last {min(20, len(df_chart))} Days)",
+        xaxis_title="Date",
+        yaxis_title="P&L ($)",
+        height=400,
+        plot_bgcolor='#0f1419',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="#e8f5e9"),
+        xaxis=dict(
+            tickformat="%b %d",
+            showgrid=False
+        ),
+        yaxis=dict(
+            gridcolor='rgba(0,255,136,0.1)',
+            zeroline=True,
+            zerolinecolor='rgba(0,255,136,0.3)'
+        ),
+        margin=dict(t=50)
+    )
+    return fig_pnl
+
+@st.cache_data(show_spinner=False)
+def build_pie_fig(pnl_values):
+    """Win / Loss / Breakeven donut from an array of trade P&Ls."""
+    results = pd.Categorical(
+        np.select([pnl_values > 0, pnl_values < 0], ['Win', 'Loss'], default='Breakeven'),
+        categories=['Win', 'Loss', 'Breakeven']
+    )
+
+    result_counts = pd.Series(results).value_counts()
+    result_counts = result_counts[result_counts > 0].rename_axis('Result').reset_index(name='Count')
+
+    pie_colors = {'Win': '#00ff88', 'Loss': '#ff4757', 'Breakeven': '#94a3b8'}
+
+    fig_pie = go.Figure(
+        go.Pie(
+            labels=result_counts['Result'],
+            values=result_counts['Count'],
+            hole=0.4,
+            marker=dict(colors=[pie_colors.get(i) for i in result_counts['Result']]),
+            textinfo='label+percent'
+        )
+    )
+
+    fig_pie.update_layout(
+        title=f"Trade Outcomes ({len(pnl_values)} trades)",
+        height=380,
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="#e8f5e9")
+    )
+    return fig_pie
+
+@st.cache_data(show_spinner=False)
+def build_trade_breakdown_fig(df_day, day):
+    """Per-trade P&L bars and running P&L line for one day's trades, in entry order."""
+    trade_numbers = np.arange(1, len(df_day) + 1)
+    pnl = df_day['pnl'].to_numpy(dtype=np.float64)
+    running_pnl = np.cumsum(pnl)
+    colors_today = np.where(pnl > 0, '#00ff88', '#ff4757')
+
+    # --- Create Plotly Figure ---
+    fig_daily = go.Figure()
+
+    # Bar: Individual trade P&L
+    fig_daily.add_trace(go.Bar(
+        x=trade_numbers,
+        y=pnl,
+        marker_color=colors_today,
+        name='Trade P&L',
+        hovertemplate=(
+            "<b>Trade #%{x}</b><br>"
+            "P&L: $%{y:,.2f}<br>"
+            "Ticker: %{customdata[0]}<br>"
+            "Direction: %{customdata[1]}<br>"
+            "Investment: $%{customdata[2]:,.2f}<extra></extra>"
+        ),
+        customdata=df_day[['ticker', 'direction', 'investment']]
+    ))
+
+    # Line: Running cumulative P&L
+    fig_daily.add_trace(go.Scatter(
+        x=trade_numbers,
+        y=running_pnl,
+        mode='lines+markers',
+        name='Running P&L',
+        yaxis='y2',
+        line=dict(color='#fbbf24', width=2),
+        marker=dict(size=6, color='#fbbf24')
+    ))
+
+    # --- Safe y-axis range ---
+    y_max = max(np.abs(pnl).max(), np.abs(running_pnl).max()) * 1.1
+    if pd.isna(y_max) or y_max <= 0:
+        y_max = 1.0
+
+    # --- Determine x-axis range (default 1-10, expand if needed) ---
+    num_trades_today = len(df_day)
+    x_axis_range = [0.5, max(10.5, num_trades_today + 0.5)]
+
+    # --- Layout ---
+    fig_daily.update_layout(
+        title=f"Trade P&L Breakdown ({day.isoformat()})",
+        xaxis_title="Trade #",
+        hovermode='x unified',
+        yaxis=dict(
+            title=dict(text="Individual P&L ($)", font=dict(color='#00ff88')),
+            tickfont=dict(color='#e8f5e9'),
+            showgrid=True,
+            gridcolor='rgba(0, 255, 136, 0.1)',
+            zeroline=True,
+            zerolinecolor='rgba(0, 255, 136, 0.3)',
+            range=[-y_max, y_max]
+        ),
+        yaxis2=dict(
+            title=dict(text="Running P&L ($)", font=dict(color='#fbbf24')),
+            tickfont=dict(color='#e8f5e9'),
+            overlaying='y',
+            side='right',
+            showgrid=False,
+            zeroline=True,
+            zerolinecolor='rgba(0, 255, 136, 0.3)',
+            range=[-y_max, y_max]
+        ),
+        xaxis=dict(
+            showgrid=False,
+            tickfont=dict(color='#e8f5e9'),
+            dtick=1,
+            range=x_axis_range
+        ),
+        plot_bgcolor='#0f1419',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Inter, sans-serif", size=12, color="#e8f5e9"),
+        title_font=dict(size=18, color='#00ff88'),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            bgcolor='rgba(0,0,0,0)',
+            font=dict(color="#e8f5e9")
+        ),
+        margin=dict(t=50, b=50, l=50, r=50),
+        height=420,
+    )
+    return fig_daily
+
+@st.cache_data(show_spinner=False)
+def build_scatter_fig(df_scatter):
+    """Trades-per-day vs daily P&L scatter."""
+    # Colors: green wins, red losses
+    colors = np.where(df_scatter['Actual P&L'].to_numpy() > 0, '#00ff88', '#ff4757')
+
+    fig_scatter = go.Figure()
+
+    # Point labels are one DOM node each, so past a few dozen days keep the dates in the hover only
+    scatter_trace = go.Scattergl if len(df_scatter) > WEBGL_POINT_THRESHOLD else go.Scatter
+    scatter_mode = 'markers+text' if len(df_scatter) <= SCATTER_LABEL_LIMIT else 'markers'
+
+    fig_scatter.add_trace(scatter_trace(
+        x=df_scatter['num_trades'],
+        y=df_scatter['Actual P&L'],
+        mode=scatter_mode,
+        marker=dict(size=12, color=colors),
+        text=df_scatter['trade_date'].astype(str),
+        textposition="top center",
+        hovertemplate="<b>%{text}</b><br>Trades: %{x}<br>P&L: $%{y:.2f}<extra></extra>"
+    ))
+
+    fig_scatter.update_layout(
+        title="Trades vs Daily Profit/Loss",
+        xaxis_title="Number of Trades",
+        yaxis_title="Daily P&L ($)",
+        plot_bgcolor='#0f1419',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="#e8f5e9"),
+        height=420,
+        xaxis=dict(showgrid=False),
+        yaxis=dict(gridcolor='rgba(0,255,136,0.1)'),
+    )
+    return fig_scatter
+
+
 # --- Tab 2: Daily Summary ---
-with tab2:
+# The chart tabs are fragments, so their date pickers and filters rerun only the tab itself.
+# They read the frames from session state because a fragment rerun doesn't re-execute the script.
+@st.fragment
+def render_daily_summary_tab():
+    df_summary = st.session_state.df_summary
+    df_trades = st.session_state.df_trades
+
     st.header("Daily Summary")
     
     if df_summary.empty:
@@ -1057,10 +1633,9 @@ with tab2:
             df_display = df_display.sort_values(by='Date', ascending=False)
             df_display['Date'] = df_display['Date'].astype(str)
         
+        # Currency columns stay numeric and are formatted by the table itself (which also sorts them correctly)
         currency_cols = ['Start Bal.', 'Target P&L', 'Actual P&L', 'Deposit/Bonus', 'End Bal.']
-        for col in currency_cols:
-             if col in df_display.columns:
-                df_display[col] = pd.to_numeric(df_display[col], errors='coerce').fillna(0).apply(lambda x: f"${x:,.2f}")
+        column_config = {col: st.column_config.NumberColumn(col, format="dollar") for col in currency_cols}
 
         cols_to_keep = ['Date', 'Week', 'Trades', 'Start Bal.', 'Target P&L', 'Actual P&L', 'Deposit/Bonus', 'End Bal.']
         df_display = df_display[[col for col in cols_to_keep if col in df_display.columns]]
@@ -1068,14 +1643,16 @@ with tab2:
         st.dataframe(
             df_display, 
             use_container_width=True,
-            hide_index=True
+            hide_index=True,
+            column_config=column_config
         )
 
         # --- Trade Breakdown Section (Date Filter) ---
         st.subheader("🗓️ Trade Breakdown (CST/CDT)")
 
         # --- Date selection ---
-        all_trade_dates = sorted(df_trades['trade_date'].dropna().unique())
+        trades_by_date = get_trades_by_date()
+        all_trade_dates = [day.date() for day in trades_by_date]
         default_date = datetime.now(CENTRAL_TZ).date()
 
         selected_date = st.date_input(
@@ -1086,102 +1663,13 @@ with tab2:
         )
 
         # --- Filter trades for selected date ---
-        df_trades_today = df_trades[df_trades['trade_date'] == pd.to_datetime(selected_date).date()].sort_index()
+        df_trades_today = trades_by_date.get(pd.Timestamp(selected_date), df_trades.iloc[0:0]).sort_index()
 
         if df_trades_today.empty:
-            st.info(f"ℹ️ No trades logged for {selected_date.strftime('%Y-%m-%d')}.")
+            st.info(f"ℹ️ No trades logged for {selected_date.isoformat()}.")
         else:
-            df_trades_today = df_trades_today.copy()
-            df_trades_today['Trade #'] = range(1, len(df_trades_today) + 1)
-            colors_today = ['#00ff88' if x > 0 else '#ff4757' for x in df_trades_today['pnl']]
-
-            # --- Create Plotly Figure ---
-            fig_daily = go.Figure()
-
-            # Bar: Individual trade P&L
-            fig_daily.add_trace(go.Bar(
-                x=df_trades_today['Trade #'],
-                y=df_trades_today['pnl'],
-                marker_color=colors_today,
-                name='Trade P&L',
-                hovertemplate=(
-                    "<b>Trade #%{x}</b><br>"
-                    "P&L: $%{y:,.2f}<br>"
-                    "Ticker: %{customdata[0]}<br>"
-                    "Direction: %{customdata[1]}<br>"
-                    "Investment: $%{customdata[2]:,.2f}<extra></extra>"
-                ),
-                customdata=df_trades_today[['ticker', 'direction', 'investment']]
-            ))
-
-            # Line: Running cumulative P&L
-            df_trades_today['Running P&L'] = df_trades_today['pnl'].cumsum()
-            fig_daily.add_trace(go.Scatter(
-                x=df_trades_today['Trade #'],
-                y=df_trades_today['Running P&L'],
-                mode='lines+markers',
-                name='Running P&L',
-                yaxis='y2',
-                line=dict(color='#fbbf24', width=2),
-                marker=dict(size=6, color='#fbbf24')
-            ))
-
-            # --- Safe y-axis range ---
-            max_pnl = df_trades_today['pnl'].abs().max()
-            max_running = df_trades_today['Running P&L'].abs().max()
-            y_max = max(max_pnl, max_running) * 1.1
-            if pd.isna(y_max) or y_max <= 0:
-                y_max = 1.0
-
-            # --- Determine x-axis range (default 1-10, expand if needed) ---
-            num_trades_today = len(df_trades_today)
-            x_axis_range = [0.5, max(10.5, num_trades_today + 0.5)]
-            
-            # --- Layout ---
-            fig_daily.update_layout(
-                title=f"Trade P&L Breakdown ({selected_date.strftime('%Y-%m-%d')})",
-                xaxis_title="Trade #",
-                hovermode='x unified',
-                yaxis=dict(
-                    title=dict(text="Individual P&L ($)", font=dict(color='#00ff88')),
-                    tickfont=dict(color='#e8f5e9'),
-                    showgrid=True,
-                    gridcolor='rgba(0, 255, 136, 0.1)',
-                    zeroline=True,
-                    zerolinecolor='rgba(0, 255, 136, 0.3)',
-                    range=[-y_max, y_max]
-                ),
-                yaxis2=dict(
-                    title=dict(text="Running P&L ($)", font=dict(color='#fbbf24')),
-                    tickfont=dict(color='#e8f5e9'),
-                    overlaying='y',
-                    side='right',
-                    showgrid=False,
-                    zeroline=True,
-                    zerolinecolor='rgba(0, 255, 136, 0.3)',
-                    range=[-y_max, y_max]
-                ),
-                xaxis=dict(
-                    showgrid=False,
-                    tickfont=dict(color='#e8f5e9'),
-                    dtick=1,
-                    range=x_axis_range
-                ),
-                plot_bgcolor='#0f1419',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(family="Inter, sans-serif", size=12, color="#e8f5e9"),
-                title_font=dict(size=18, color='#00ff88'),
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1,
-                    bgcolor='rgba(0,0,0,0)',
-                    font=dict(color="#e8f5e9")
-                ),
-                margin=dict(t=50, b=50, l=50, r=50),
-                height=420,
+            fig_daily = build_trade_breakdown_fig(
+                df_trades_today[['ticker', 'direction', 'investment', 'pnl']], selected_date
             )
 
             # --- Display chart ---
@@ -1189,82 +1677,19 @@ with tab2:
         
         st.subheader("📈 Balance Progression")
         
-        df_chart = df_summary.sort_values(by='Date', ascending=True)
-
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=df_chart['Date'].astype(str),
-            y=df_chart['End Bal.'],
-            mode='lines+markers',
-            name='End Balance',
-            line=dict(color='#00ff88', width=3, shape='spline'),
-            marker=dict(size=8, color='#00d97e', line=dict(color='#0a0e0f', width=2)),
-            fill='tozeroy',
-            fillcolor='rgba(0, 255, 136, 0.1)'
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=df_chart['Date'].astype(str),
-            y=df_chart['Start Bal.'],
-            mode='lines+markers',
-            name='Start Balance',
-            line=dict(color='#fbbf24', width=2, dash='dot'), 
-            marker=dict(size=6, color='#fbbf24')
-        ))
-
-        fig.add_trace(go.Scatter(
-            x=df_chart['Date'].astype(str),
-            y=df_chart['Start Bal.'] + df_chart['Target P&L'],
-            mode='lines',
-            name='Target End Bal',
-            line=dict(color='#34d399', width=2, dash='dash')
-        ))
-        
-        if not df_chart.empty:
-            min_bal = df_chart[['End Bal.', 'Start Bal.']].min().min()
-            max_bal = df_chart[['End Bal.', 'Start Bal.']].max().max()
-            padding = (max_bal - min_bal) * 0.1 
-            y_range = [max(0, min_bal - padding), max_bal + padding]
-        else:
-            y_range = [0, 100]
-
-        fig.update_layout(
-            title='Balance Progression Over Time',
-            xaxis_title="Date", 
-            yaxis_title="Balance ($)",
-            hovermode='x unified',
-            height=450,
-            plot_bgcolor='#0f1419', 
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family="Inter, sans-serif", size=12, color="#e8f5e9"),
-            title_font=dict(size=20, color='#00ff88', family="Inter"),
-            legend=dict(
-                orientation="h", 
-                yanchor="bottom", y=1.02, xanchor="right", x=1, 
-                bgcolor='rgba(0,0,0,0)',
-                font=dict(color="#e8f5e9")
-            ),
-            xaxis=dict(
-                showgrid=True, 
-                gridcolor='rgba(0, 255, 136, 0.1)',
-                tickfont=dict(color='#e8f5e9'),
-                tickformat="%b %d<br>%Y",
-                dtick='d' 
-            ),
-            yaxis=dict(
-                showgrid=True, 
-                gridcolor='rgba(0, 255, 136, 0.1)',
-                tickfont=dict(color='#e8f5e9'),
-                autorange=False, 
-                range=y_range 
-            ),
-            margin=dict(t=50) 
-        )
+        # The session summary is kept in date order (prepare_summary and the deposit patch sort it)
+        fig = build_balance_fig(df_summary[['Date', 'Start Bal.', 'Target P&L', 'End Bal.']])
         st.plotly_chart(fig, use_container_width=True)
 
+with tab2:
+    render_daily_summary_tab()
+
 # --- Tab 3: Performance Analytics ---
-with tab3:
+@st.fragment
+def render_analytics_tab():
+    df_summary = st.session_state.df_summary
+    df_trades = st.session_state.df_trades
+
     st.header("Performance Analytics")
 
     if df_trades.empty:
@@ -1272,13 +1697,7 @@ with tab3:
     else:
 
         # ---- Date Range + Week + Ticker Filters ----
-        all_dates = pd.to_datetime(
-            list(df_summary['Date'].unique()) + 
-            list(df_trades['trade_date'].unique())
-        ).unique()
-
-        min_date_overall = min(all_dates)
-        max_date_overall = max(all_dates)
+        min_date_overall, max_date_overall = get_date_bounds()
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1286,16 +1705,16 @@ with tab3:
         with col2:
             end_date = st.date_input("End Date", value=max_date_overall, min_value=min_date_overall, max_value=max_date_overall)
         with col3:
-            available_weeks = sorted(df_summary['Week'].unique())
+            available_weeks = sorted_labels(df_summary['Week'])
             selected_weeks = st.multiselect("Filter by Week #", available_weeks, default=available_weeks)
 
-        unique_tickers = sorted(df_trades['ticker'].dropna().unique())
+        unique_tickers = sorted_labels(df_trades['ticker'])
         selected_tickers = st.multiselect("Filter by Ticker(s)", options=unique_tickers, default=unique_tickers)
 
         # ---- Apply Filters ----
         if start_date > end_date:
             st.error("Start Date must be before End Date")
-            st.stop()
+            return
 
         df_summary_filtered = df_summary[
             (df_summary['Date'] >= start_date) &
@@ -1303,78 +1722,52 @@ with tab3:
             (df_summary['Week'].isin(selected_weeks))
         ]
 
-        df_trades_filtered = df_trades[
-            (df_trades['trade_date'] >= start_date) &
-            (df_trades['trade_date'] <= end_date)
-        ]
+        trade_days = df_trades['trade_date']
+        if trade_days.is_monotonic_increasing:
+            # Loaded trades are sorted by day, so the range is one slice found by binary search
+            lo = trade_days.searchsorted(pd.Timestamp(start_date), side='left')
+            hi = trade_days.searchsorted(pd.Timestamp(end_date), side='right')
+            df_trades_filtered = df_trades.iloc[lo:hi]
+        else:
+            # Trades submitted this session are appended unsorted until the next load
+            df_trades_filtered = df_trades[
+                (trade_days >= pd.Timestamp(start_date)) &
+                (trade_days <= pd.Timestamp(end_date))
+            ]
 
         if len(selected_tickers) > 0:
             df_trades_filtered = df_trades_filtered[df_trades_filtered['ticker'].isin(selected_tickers)]
 
+        # ---- Per-day P&L and trade counts in a single groupby, shared by the charts below ----
+        daily_trade_perf = df_trades_filtered.groupby('trade_date')['pnl'].agg(['sum', 'size'])
+        # Summary rows are keyed by date objects, so only the per-day index is converted
+        daily_trade_perf.index = pd.Index(daily_trade_perf.index.date, name='trade_date')
+
         # ---- Recompute daily P&L from filtered trades ----
         if not df_trades_filtered.empty:
-            daily_trade_perf = (
-                df_trades_filtered.groupby('trade_date', as_index=False)['pnl']
-                .sum()
-                .rename(columns={'trade_date': 'Date', 'pnl': 'Actual P&L'})
-            )
-
-            df_summary_filtered = pd.merge(
-                df_summary_filtered, daily_trade_perf,
-                on='Date', how='left', suffixes=('', '_recalc')
+            # A hash lookup per summary row instead of a join plus suffix-column cleanup
+            recalculated_pnl = df_summary_filtered['Date'].map(daily_trade_perf['sum'])
+            df_summary_filtered = df_summary_filtered.assign(
+                **{'Actual P&L': recalculated_pnl.fillna(df_summary_filtered['Actual P&L'])}
             )
 
-            df_summary_filtered['Actual P&L'] = df_summary_filtered['Actual P&L_recalc'].fillna(
-                df_summary_filtered['Actual P&L']
-            )
-            df_summary_filtered.drop(columns=['Actual P&L_recalc'], inplace=True)
-
         st.caption(f"📅 {start_date} → {end_date} | 🧾 Weeks: {', '.join(selected_weeks)} | 🏷️ Tickers: {', '.join(selected_tickers)}")
 
         if df_summary_filtered.empty or df_trades_filtered.empty:
             st.info("No trading data found for selected filters.")
-            st.stop()
+            return
 
         # ---- Daily P&L Chart (with last 20 days sliding window) ----
         st.subheader("💵 Daily P&L")
 
-        df_chart = df_summary_filtered.sort_values(by='Date')
+        # Filtering keeps the summary's date order, so the window needs no re-sort
+        df_chart = df_summary_filtered
         
         # Slide window: last 20 days
         if len(df_chart) > 20:
             df_chart = df_chart.tail(20)
 
-        # Colors for bars
-        colors = ['#00ff88' if x > 0 else '#ff4757' for x in df_chart['Actual P&L']]
-
-        fig_pnl = go.Figure()
-        fig_pnl.add_trace(go.Bar(
-            x=df_chart['Date'].astype(str),
-            y=df_chart['Actual P&L'],
-            marker_color=colors,
-            text=df_chart['Actual P&L'].apply(lambda x: f'${x:,.2f}'),
-            textposition='auto'
-        ))
-
-        fig_pnl.update_layout(
-            title=f"Daily P&L (Last {min(20, len(df_chart))} Days)",
-            xaxis_title="Date",
-            yaxis_title="P&L ($)",
-            height=400,
-            plot_bgcolor='#0f1419',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color="#e8f5e9"),
-            xaxis=dict(
-                tickformat="%b %d",
-                showgrid=False
-            ),
-            yaxis=dict(
-                gridcolor='rgba(0,255,136,0.1)',
-                zeroline=True,
-                zerolinecolor='rgba(0,255,136,0.3)'
-            ),
-            margin=dict(t=50)
-        )
+        fig_pnl = build_pnl_fig(df_chart[['Date', 'Actual P&L']])
 
         st.plotly_chart(fig_pnl, use_container_width=True)
 
@@ -1382,12 +1775,8 @@ with tab3:
         # ---- Trades vs P&L Scatter Plot ----
         st.subheader("📊 Trades vs Daily P&L")
 
-        # Group trades per day
-        df_trades_count = (
-            df_trades_filtered.groupby('trade_date')
-            .size()
-            .reset_index(name='num_trades')
-        )
+        # Trades per day (already aggregated above)
+        df_trades_count = daily_trade_perf['size'].reset_index(name='num_trades')
 
         # Merge with daily P&L
         df_scatter = pd.merge(
@@ -1400,32 +1789,7 @@ with tab3:
 
         df_scatter.dropna(subset=['Actual P&L'], inplace=True)
 
-        # Colors: green wins, red losses
-        df_scatter['color'] = df_scatter['Actual P&L'].apply(lambda x: '#00ff88' if x > 0 else '#ff4757')
-
-        fig_scatter = go.Figure()
-
-        fig_scatter.add_trace(go.Scatter(
-            x=df_scatter['num_trades'],
-            y=df_scatter['Actual P&L'],
-            mode='markers+text',
-            marker=dict(size=12, color=df_scatter['color']),
-            text=df_scatter['trade_date'].astype(str),
-            textposition="top center",
-            hovertemplate="<b>%{text}</b><br>Trades: %{x}<br>P&L: $%{y:.2f}<extra></extra>"
-        ))
-
-        fig_scatter.update_layout(
-            title="Trades vs Daily Profit/Loss",
-            xaxis_title="Number of Trades",
-            yaxis_title="Daily P&L ($)",
-            plot_bgcolor='#0f1419',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color="#e8f5e9"),
-            height=420,
-            xaxis=dict(showgrid=False),
-            yaxis=dict(gridcolor='rgba(0,255,136,0.1)'),
-        )
+        fig_scatter = build_scatter_fig(df_scatter[['trade_date', 'num_trades', 'Actual P&L']])
 
         st.plotly_chart(fig_scatter, use_container_width=True)
 
@@ -1433,52 +1797,85 @@ with tab3:
         # ---- Pie Chart ----
         st.subheader("🎯 Win / Loss Breakdown")
 
-        df_temp = df_trades_filtered.copy()
-        df_temp['Result'] = df_temp['pnl'].apply(lambda x: 'Win' if x > 0 else ('Loss' if x < 0 else 'Breakeven'))
-
-        result_counts = df_temp['Result'].value_counts().reset_index()
-        result_counts.columns = ['Result', 'Count']
-
-        pie_colors = {'Win': '#00ff88', 'Loss': '#ff4757', 'Breakeven': '#94a3b8'}
-
-        fig_pie = go.Figure(
-            go.Pie(
-                labels=result_counts['Result'],
-                values=result_counts['Count'],
-                hole=0.4,
-                marker=dict(colors=[pie_colors.get(i) for i in result_counts['Result']]),
-                textinfo='label+percent'
-            )
-        )
-
-        fig_pie.update_layout(
-            title=f"Trade Outcomes ({df_trades_filtered.shape[0]} trades)",
-            height=380,
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color="#e8f5e9")
-        )
+        fig_pie = build_pie_fig(df_trades_filtered['pnl'].to_numpy())
 
         st.plotly_chart(fig_pie, use_container_width=True)
 
+with tab3:
+    render_analytics_tab()
+
 
 # --- TAB 4: Smart Position Sizing Calculator (Direction Aware) ---
-import requests
-import math
+BITUNIX_MARKET_API = "https://openapi.bitunix.com/api/v1/market"
+# The Live Tracker forces fresh requests through refresh_key, so this mainly bounds how stale a
+# price can get on reruns that aren't a refresh (target edits, the calculator's live price)
+MARKET_CACHE_TTL = 30  # seconds
+# Price history is keyed on a shared clock window instead of each session's refresh time, so every
+# session watching a symbol reuses one kline request per window (st.cache_data is process-wide)
+HISTORY_SHARE_WINDOW = 15  # seconds
+
+@st.cache_resource
+def get_http_session():
+    """
+    Shared requests session, so Bitunix calls reuse pooled TCP/TLS connections across reruns.
+    Connection errors and gateway errors are retried a few times with a short backoff.
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry))
+    return session
+
+@st.cache_data(ttl=MARKET_CACHE_TTL, show_spinner=False)
+def fetch_market_data(endpoint, symbol, refresh_key=None, **params):
+    """
+    GETs a Bitunix market endpoint and returns the decoded JSON.
+    Reruns within MARKET_CACHE_TTL reuse the response; a new `refresh_key` (the Live Tracker's
+    last refresh time) forces a fresh request. The ticker is shared by every helper that reads it.
+    """
+    response = get_http_session().get(
+        f"{BITUNIX_MARKET_API}/{endpoint}", params={'symbol': symbol, **params}, timeout=(3, 10)
+    )
+    # Raising keeps an error response out of the cache, so the next call asks again
+    response.raise_for_status()
+    return response.json()
+
+def ticker_price(data):
+    """Last price from a ticker response, or None."""
+    if data.get("data") and isinstance(data["data"], list) and len(data["data"]) > 0:
+        return float(data["data"][0]["lastPrice"])
+    elif isinstance(data.get("data"), dict) and data["data"].get("lastPrice"):
+        return float(data["data"]["lastPrice"])
+    return None
 
 def get_live_price(symbol):
     """Fetch latest coin price from Bitunix API."""
     try:
-        url = f"https://openapi.bitunix.com/api/v1/market/ticker?symbol={symbol.upper()}"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        if data.get("data"):
-            if isinstance(data["data"], list) and len(data["data"]) > 0:
-                return float(data["data"][0]["lastPrice"])
-            elif isinstance(data["data"], dict):
-                return float(data["data"].get("lastPrice", 0))
+        return ticker_price(fetch_market_data("ticker", symbol.upper()))
     except Exception:
         return None
-    return None
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def compute_avg_plan(portfolio, leverage, starter_pct, add1_pct, add2_pct, add1_change, add2_change,
+                     entry_price, is_long):
+    """
+    Margins, notionals, add prices and running average entries for the Starter / Add-1 / Add-2 stages,
+    plus the margin-weighted entry improvement. Pure in its scalar inputs, so reruns where only
+    another widget changed are a cache hit.
+    """
+    margins = portfolio * np.array([starter_pct, add1_pct, add2_pct], dtype=np.float64) / 100
+    notionals = margins * leverage
+    changes = np.array([0.0, add1_change, add2_change])
+    avg_improve = (changes @ margins) / margins.sum()
+
+    if entry_price > 0:
+        # Longs add on the way down, shorts on the way up
+        sign = -1 if is_long else 1
+        prices = entry_price * (1 + sign * changes / 100)
+        # Notional-weighted average entry after each stage
+        avgs = np.cumsum(prices * notionals) / np.cumsum(notionals)
+    else:
+        prices = avgs = np.zeros(3)
+    return margins, notionals, prices, avgs, avg_improve
 
 
 with tab4:
@@ -1551,46 +1948,17 @@ with tab4:
             help="For Long = drop %, For Short = rise %"
         )
 
-    # --- Core Margin & Exposure Calculations ---
-    starter_margin = portfolio * starter_pct / 100
-    add1_margin = portfolio * add1_pct / 100
-    add2_margin = portfolio * add2_pct / 100
-    total_margin = starter_margin + add1_margin + add2_margin
-
-    starter_notional = starter_margin * leverage
-    add1_notional = add1_margin * leverage
-    add2_notional = add2_margin * leverage
-    total_notional = total_margin * leverage
-
-    avg_improve = ((add1_change * add1_margin) + (add2_change * add2_margin)) / (
-        starter_margin + add1_margin + add2_margin
+    # --- Core Margin, Exposure & Avg Entry Calculations (Direction Aware) ---
+    margins, notionals, prices, avgs, avg_improve = compute_avg_plan(
+        portfolio, leverage, starter_pct, add1_pct, add2_pct, add1_change, add2_change,
+        entry_price, direction == "Long"
     )
-
-    # --- Compute New Avg Entry Prices (Direction Aware) ---
-    if entry_price > 0:
-        if direction == "Long":
-            price_add1 = entry_price * (1 - add1_change / 100)
-            price_add2 = entry_price * (1 - add2_change / 100)
-        else:
-            price_add1 = entry_price * (1 + add1_change / 100)
-            price_add2 = entry_price * (1 + add2_change / 100)
-
-        # Starter only
-        avg1 = entry_price
-
-        # After Add-1
-        total1 = starter_notional + add1_notional
-        avg2 = ((starter_notional * entry_price) + (add1_notional * price_add1)) / total1
-
-        # After Add-2
-        total2 = starter_notional + add1_notional + add2_notional
-        avg3 = (
-            (starter_notional * entry_price)
-            + (add1_notional * price_add1)
-            + (add2_notional * price_add2)
-        ) / total2
-    else:
-        price_add1 = price_add2 = avg1 = avg2 = avg3 = 0.0
+    starter_margin, add1_margin, add2_margin = margins
+    starter_notional, add1_notional, add2_notional = notionals
+    total_margin = margins.sum()
+    total_notional = total_margin * leverage
+    price_add1, price_add2 = prices[1:]
+    avg1, avg2, avg3 = avgs
 
     # --- Display Summary ---
     st.markdown("### 📊 Position Plan Summary")
@@ -1663,117 +2031,152 @@ with tab4:
 
 
 # --- Tab 5: Live Tracker ---
-import requests
-import time
+# (zone, description, color, recommendation) for each price band, from below the stop loss up
+LIVE_ZONES = (
+    ("❌ EXIT ZONE", "Price broke below stop loss", "#ff4757",
+     "🚨 **Action:** Exit position immediately to limit losses"),
+    ("🟠 DANGER ZONE", "Price near stop loss", "#ff9900",
+     "⚠️ **Action:** Watch closely, consider tightening stop loss"),
+    ("🟢 SAFE ZONE", "Above breakeven, momentum building", "#00cc66",
+     "✅ **Action:** Hold position, move stop to breakeven"),
+    ("💎 TARGET 1 HIT", "First target achieved", "#0099ff",
+     "💰 **Action:** Take 40-50% profit, trail stop under breakeven"),
+    ("🚀 TARGET 2 ZONE", "Maximum target zone", "#33ccff",
+     "🎯 **Action:** Take remaining profits, trail stop aggressively"),
+)
+
+# The header card and recommendation box of each zone, built once instead of formatted on every panel run
+ZONE_CARDS = {
+    zone: f"""
+    <div style='padding:20px; background: linear-gradient(135deg, {color}20, {color}40); 
+                border-left: 5px solid {color}; border-radius:12px; margin-bottom:20px;'>
+        <h2 style='color:{color}; margin:0; font-size:28px;'>{zone}</h2>
+        <p style='color:#e8f5e9; margin:5px 0 0 0; font-size:16px;'>{zone_desc}</p>
+    </div>
+    """
+    for zone, zone_desc, color, _ in LIVE_ZONES
+}
+# The recommendation carries the rules around it, so the box and both separators go out as one element
+ZONE_RECOMMENDATIONS = {
+    zone: f"""
+    <hr>
+    <div style='padding:15px; background-color:rgba(0, 255, 136, 0.1); 
+                border-left:4px solid #00ff88; border-radius:10px;'>
+        <p style='color:#e8f5e9; margin:0; font-size:16px;'>{recommendation}</p>
+    </div>
+    <hr>
+    """
+    for zone, _, _, recommendation in LIVE_ZONES
+}
+
+# Number formats shared by the Live Tracker metrics and targets table, bound once
+format_price = "${:.4f}".format
+format_pct = "{:.2f}%".format
+format_volume = "${:,.0f}".format
+
+def classify_zone(price, be, tp1, tp2, sl):
+    """Returns the LIVE_ZONES entry for a price against the trade's stop loss, breakeven and targets."""
+    if price < sl:
+        return LIVE_ZONES[0]
+    if price < be:
+        return LIVE_ZONES[1]
+    if price < tp1:
+        return LIVE_ZONES[2]
+    if price < tp2:
+        return LIVE_ZONES[3]
+    return LIVE_ZONES[4]
 
 def calculate_rsi(prices, period=14):
-    """Compute RSI manually using pure pandas."""
-    if len(prices) < period:
+    """
+    RSI over the last `period` price changes, using simple averages of gains and losses.
+    Only the final value is shown, so only the last period + 1 prices are looked at.
+    """
+    closes = np.asarray(prices, dtype=np.float64)[-(period + 1):]
+    if closes.size < period + 1:
         return 50.0  # neutral
-    delta = pd.Series(prices).diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
-    rs = avg_gain / avg_loss.replace(0, np.nan)
-    rsi = 100 - (100 / (1 + rs))
-    return rsi.iloc[-1] if not np.isnan(rsi.iloc[-1]) else 50.0
-
-def get_price(symbol):
-    """Fetch current price from Bitunix API."""
-    try:
-        url = f"https://openapi.bitunix.com/api/v1/market/ticker?symbol={symbol}"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        if data.get("data") and isinstance(data["data"], list) and len(data["data"]) > 0:
-            return float(data["data"][0]["lastPrice"])
-        elif data.get("data", {}).get("lastPrice"):
-            return float(data["data"]["lastPrice"])
-    except Exception as e:
-        st.error(f"API Error: {e}")
-    return None
+    delta = np.diff(closes)
+    avg_gain = np.maximum(delta, 0.0).mean()
+    avg_loss = np.maximum(-delta, 0.0).mean()
+    if avg_loss == 0:
+        return 50.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+def ticker_24h_stats(data):
+    """24h high, low, volume and change from a ticker response."""
+    if data.get("data") and isinstance(data["data"], list) and len(data["data"]) > 0:
+        ticker = data["data"][0]
+        return {
+            'high': float(ticker.get("high24h", 0)),
+            'low': float(ticker.get("low24h", 0)),
+            'volume': float(ticker.get("volume24h", 0)),
+            'change_pct': float(ticker.get("priceChangePercent", 0))
+        }
+    return {'high': 0, 'low': 0, 'volume': 0, 'change_pct': 0}
+
+def kline_closes(data):
+    """Close prices from a kline response."""
+    return [float(item[4]) for item in data.get("data", [])]
 
-def get_price_history(symbol, limit=100):
-    """Fetch recent price history for RSI calculation."""
+@st.cache_resource
+def get_market_executor():
+    """Worker threads shared by all sessions for concurrent Bitunix requests."""
+    return ThreadPoolExecutor(max_workers=3)
+
+def _fetch_in_worker(ctx, *args, **kwargs):
+    """Runs fetch_market_data on a pool thread under the caller's run context."""
+    thread = threading.current_thread()
+    previous_ctx = getattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+    add_script_run_ctx(thread, ctx)
     try:
-        url = f"https://openapi.bitunix.com/api/v1/market/kline?symbol={symbol}&interval=1m&limit={limit}"
-        response = requests.get(url, timeout=10)
-        data = response.json().get("data", [])
-        prices = [float(item[4]) for item in data]  # close prices
-        return prices
-    except Exception:
-        return []
+        return fetch_market_data(*args, **kwargs)
+    finally:
+        # Pool threads outlive the run, so the next job (maybe another session's) must not inherit it
+        setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, previous_ctx)
 
-def get_24h_stats(symbol):
-    """Fetch 24h high, low, volume from API."""
+def fetch_all(symbol, refresh_key=None, limit=100):
+    """
+    Fetches the ticker and the recent price history concurrently, so the Live Tracker waits for
+    the slower request rather than both. Returns {'price', 'stats', 'history'}.
+    The ticker follows `refresh_key`; the history, only read for the RSI, follows HISTORY_SHARE_WINDOW.
+    """
+    ctx = get_script_run_ctx()
+    executor = get_market_executor()
+    history_key = int(time.time() // HISTORY_SHARE_WINDOW)
+    ticker = executor.submit(_fetch_in_worker, ctx, "ticker", symbol, refresh_key)
+    history = executor.submit(_fetch_in_worker, ctx, "kline", symbol, history_key, interval="1m", limit=limit)
+    wait([ticker, history], timeout=10)
+
+    market = {'price': None, 'stats': ticker_24h_stats({}), 'history': []}
+    if not ticker.done():
+        # The pool is shared by every session, so a busy pool shows up here as well as a slow API
+        st.error("API Error: the price request timed out.")
+    else:
+        try:
+            ticker_data = ticker.result()
+            market['price'] = ticker_price(ticker_data)
+            market['stats'] = ticker_24h_stats(ticker_data)
+        except Exception as e:
+            st.error(f"API Error: {e}")
     try:
-        url = f"https://openapi.bitunix.com/api/v1/market/ticker?symbol={symbol}"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        if data.get("data") and isinstance(data["data"], list) and len(data["data"]) > 0:
-            ticker = data["data"][0]
-            return {
-                'high': float(ticker.get("high24h", 0)),
-                'low': float(ticker.get("low24h", 0)),
-                'volume': float(ticker.get("volume24h", 0)),
-                'change_pct': float(ticker.get("priceChangePercent", 0))
-            }
+        market['history'] = kline_closes(history.result(timeout=0))
     except Exception:
         pass
-    return {'high': 0, 'low': 0, 'volume': 0, 'change_pct': 0}
+    return market
 
-with tab5:
-    st.header("📡 Live Trade Tracker")
-    
-    # Initialize session state
-    if 'last_refresh_time' not in st.session_state:
-        st.session_state.last_refresh_time = time.time()
-    if 'tracker_symbol' not in st.session_state:
-        st.session_state.tracker_symbol = "GIGGLEUSDT"
-    if 'tracker_targets' not in st.session_state:
-        st.session_state.tracker_targets = {'be': 196.0, 'tp1': 199.1, 'tp2': 200.2, 'sl': 189.5}
-    
-    # --- User Inputs ---
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        symbol = st.text_input(
-            "Trading Pair", 
-            value=st.session_state.tracker_symbol,
-            help="e.g., BTCUSDT, GIGGLEUSDT"
-        ).upper()
-        st.session_state.tracker_symbol = symbol
-    
-    with col2:
-        refresh_sec = st.number_input(
-            "Refresh Interval (sec)", 
-            min_value=5, 
-            max_value=120, 
-            value=20,
-            help="Auto-refresh interval"
-        )
-    
-    with col3:
-        st.markdown("<br>", unsafe_allow_html=True)
-        auto_refresh = st.toggle("🔄 Auto-Refresh", value=False)
-    
-    st.markdown("---")
-    
+def render_live_panel(symbol, auto_refresh, refresh_sec):
+    """Targets and live price panel; run as a fragment so refresh ticks and target edits skip the Sheets tabs."""
     # --- Set Targets ---
     st.subheader("🎯 Set Your Trade Targets")
     colA, colB, colC, colD = st.columns(4)
     
     with colA:
-        be = st.number_input("💚 Breakeven", value=st.session_state.tracker_targets['be'], format="%.4f")
-        st.session_state.tracker_targets['be'] = be
+        be = st.number_input("💚 Breakeven", key="tracker_be", format="%.4f")
     with colB:
-        tp1 = st.number_input("🎯 Target 1", value=st.session_state.tracker_targets['tp1'], format="%.4f")
-        st.session_state.tracker_targets['tp1'] = tp1
+        tp1 = st.number_input("🎯 Target 1", key="tracker_tp1", format="%.4f")
     with colC:
-        tp2 = st.number_input("🚀 Target 2", value=st.session_state.tracker_targets['tp2'], format="%.4f")
-        st.session_state.tracker_targets['tp2'] = tp2
+        tp2 = st.number_input("🚀 Target 2", key="tracker_tp2", format="%.4f")
     with colD:
-        sl = st.number_input("🛑 Stop Loss", value=st.session_state.tracker_targets['sl'], format="%.4f")
-        st.session_state.tracker_targets['sl'] = sl
+        sl = st.number_input("🛑 Stop Loss", key="tracker_sl", format="%.4f")
     
     st.markdown("---")
     
@@ -1786,60 +2189,32 @@ with tab5:
     # --- Check if we should refresh ---
     current_time = time.time()
     time_since_refresh = current_time - st.session_state.last_refresh_time
-    should_refresh = manual_refresh or (auto_refresh and time_since_refresh >= refresh_sec)
+    # A run_every tick lands about refresh_sec after the last fetch, so allow a second of slack
+    should_refresh = manual_refresh or (auto_refresh and time_since_refresh >= refresh_sec - 1)
     
     if should_refresh:
         st.session_state.last_refresh_time = current_time
     
     # --- Render Live Panel ---
     with display_placeholder.container():
-        # Fetch live data
-        price = get_price(symbol)
+        # Fetch live data; responses are reused until the next refresh or MARKET_CACHE_TTL
+        market = fetch_all(symbol, st.session_state.last_refresh_time)
+        price = market['price']
         
         if price is None:
             st.error(f"⚠️ Could not fetch live data for **{symbol}**")
             st.info("💡 **Troubleshooting Tips:**\n- Check if the symbol is correct (e.g., BTCUSDT, ETHUSDT)\n- Verify your internet connection\n- The Bitunix API may be temporarily unavailable")
         else:
             # Get additional data
-            prices = get_price_history(symbol)
+            prices = market['history']
             rsi_val = round(calculate_rsi(prices), 2) if prices else 50.0
-            stats_24h = get_24h_stats(symbol)
+            stats_24h = market['stats']
             
             # Calculate zone and color
-            if price < sl:
-                zone = "❌ EXIT ZONE"
-                zone_desc = "Price broke below stop loss"
-                color = "#ff4757"
-                recommendation = "🚨 **Action:** Exit position immediately to limit losses"
-            elif sl <= price < be:
-                zone = "🟠 DANGER ZONE"
-                zone_desc = "Price near stop loss"
-                color = "#ff9900"
-                recommendation = "⚠️ **Action:** Watch closely, consider tightening stop loss"
-            elif be <= price < tp1:
-                zone = "🟢 SAFE ZONE"
-                zone_desc = "Above breakeven, momentum building"
-                color = "#00cc66"
-                recommendation = "✅ **Action:** Hold position, move stop to breakeven"
-            elif tp1 <= price < tp2:
-                zone = "💎 TARGET 1 HIT"
-                zone_desc = "First target achieved"
-                color = "#0099ff"
-                recommendation = "💰 **Action:** Take 40-50% profit, trail stop under breakeven"
-            else:
-                zone = "🚀 TARGET 2 ZONE"
-                zone_desc = "Maximum target zone"
-                color = "#33ccff"
-                recommendation = "🎯 **Action:** Take remaining profits, trail stop aggressively"
+            zone = classify_zone(price, be, tp1, tp2, sl)[0]
             
             # --- Display Header Card ---
-            st.markdown(f"""
-            <div style='padding:20px; background: linear-gradient(135deg, {color}20, {color}40); 
-                        border-left: 5px solid {color}; border-radius:12px; margin-bottom:20px;'>
-                <h2 style='color:{color}; margin:0; font-size:28px;'>{zone}</h2>
-                <p style='color:#e8f5e9; margin:5px 0 0 0; font-size:16px;'>{zone_desc}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(ZONE_CARDS[zone], unsafe_allow_html=True)
             
             # --- Main Metrics ---
             col1, col2, col3, col4, col5 = st.columns(5)
@@ -1847,8 +2222,8 @@ with tab5:
             with col1:
                 st.metric(
                     label="💹 Current Price",
-                    value=f"${price:.4f}",
-                    delta=f"{stats_24h['change_pct']:.2f}%" if stats_24h['change_pct'] != 0 else None
+                    value=format_price(price),
+                    delta=format_pct(stats_24h['change_pct']) if stats_24h['change_pct'] != 0 else None
                 )
             
             with col2:
@@ -1863,19 +2238,19 @@ with tab5:
             with col3:
                 st.metric(
                     label="📈 24h High",
-                    value=f"${stats_24h['high']:.4f}" if stats_24h['high'] > 0 else "N/A"
+                    value=format_price(stats_24h['high']) if stats_24h['high'] > 0 else "N/A"
                 )
             
             with col4:
                 st.metric(
                     label="📉 24h Low",
-                    value=f"${stats_24h['low']:.4f}" if stats_24h['low'] > 0 else "N/A"
+                    value=format_price(stats_24h['low']) if stats_24h['low'] > 0 else "N/A"
                 )
             
             with col5:
                 st.metric(
                     label="📊 24h Volume",
-                    value=f"${stats_24h['volume']:,.0f}" if stats_24h['volume'] > 0 else "N/A"
+                    value=format_volume(stats_24h['volume']) if stats_24h['volume'] > 0 else "N/A"
                 )
             
             st.markdown("---")
@@ -1883,31 +2258,32 @@ with tab5:
             # --- Target Progress Visualization ---
             st.subheader("🎯 Target Progress")
             
-            # Calculate distances
-            dist_to_tp1 = ((tp1 - price) / price) * 100
-            dist_to_tp2 = ((tp2 - price) / price) * 100
-            dist_to_sl = ((price - sl) / price) * 100
+            # Calculate distances once; the targets table below reuses them
+            levels = np.array([sl, be, tp1, tp2], dtype=np.float64)
+            dist_pct = (price - levels) / price * 100.0
+            dist_to_sl = dist_pct[0]
+            dist_to_tp1, dist_to_tp2 = -dist_pct[2:]
             
             col_prog1, col_prog2, col_prog3 = st.columns(3)
             
             with col_prog1:
                 st.metric(
                     label="🎯 Distance to TP1",
-                    value=f"{abs(dist_to_tp1):.2f}%",
-                    delta="Hit ✅" if price >= tp1 else f"{dist_to_tp1:.2f}%"
+                    value=format_pct(abs(dist_to_tp1)),
+                    delta="Hit ✅" if price >= tp1 else format_pct(dist_to_tp1)
                 )
             
             with col_prog2:
                 st.metric(
                     label="🚀 Distance to TP2",
-                    value=f"{abs(dist_to_tp2):.2f}%",
-                    delta="Hit ✅" if price >= tp2 else f"{dist_to_tp2:.2f}%"
+                    value=format_pct(abs(dist_to_tp2)),
+                    delta="Hit ✅" if price >= tp2 else format_pct(dist_to_tp2)
                 )
             
             with col_prog3:
                 st.metric(
                     label="🛑 Distance from SL",
-                    value=f"{abs(dist_to_sl):.2f}%",
+                    value=format_pct(abs(dist_to_sl)),
                     delta="Safe ✅" if dist_to_sl > 2 else "⚠️ Close"
                 )
             
@@ -1916,48 +2292,72 @@ with tab5:
                 progress_ratio = min(max((price - sl) / (tp2 - sl), 0), 1)
                 st.progress(progress_ratio, text=f"Progress to TP2: {progress_ratio*100:.1f}%")
             
-            st.markdown("---")
-            
-            # --- Recommendation Box ---
-            st.markdown(f"""
-            <div style='padding:15px; background-color:rgba(0, 255, 136, 0.1); 
-                        border-left:4px solid #00ff88; border-radius:10px;'>
-                <p style='color:#e8f5e9; margin:0; font-size:16px;'>{recommendation}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("---")
+            # --- Recommendation Box (with the separators above and below it) ---
+            st.markdown(ZONE_RECOMMENDATIONS[zone], unsafe_allow_html=True)
             
             # --- Target Reference Table ---
             with st.expander("📋 View All Targets", expanded=False):
-                target_data = pd.DataFrame({
-                    'Level': ['🛑 Stop Loss', '💚 Breakeven', '🎯 Target 1', '🚀 Target 2'],
-                    'Price': [f"${sl:.4f}", f"${be:.4f}", f"${tp1:.4f}", f"${tp2:.4f}"],
-                    'Distance': [
-                        f"{((price - sl) / price * 100):.2f}%",
-                        f"{((price - be) / price * 100):.2f}%",
-                        f"{((price - tp1) / price * 100):.2f}%",
-                        f"{((price - tp2) / price * 100):.2f}%"
-                    ],
-                    'Status': [
-                        '✅ Safe' if price > sl else '❌ Hit',
-                        '✅ Above' if price >= be else '⚠️ Below',
-                        '✅ Hit' if price >= tp1 else '⏳ Pending',
-                        '✅ Hit' if price >= tp2 else '⏳ Pending'
-                    ]
-                })
-                st.dataframe(target_data, use_container_width=True, hide_index=True)
+                # Four fixed rows, so render a Markdown table instead of building a DataFrame for the grid
+                target_rows = (
+                    ('🛑 Stop Loss', '✅ Safe' if price > sl else '❌ Hit'),
+                    ('💚 Breakeven', '✅ Above' if price >= be else '⚠️ Below'),
+                    ('🎯 Target 1', '✅ Hit' if price >= tp1 else '⏳ Pending'),
+                    ('🚀 Target 2', '✅ Hit' if price >= tp2 else '⏳ Pending'),
+                )
+                st.markdown("| Level | Price | Distance | Status |\n|---|---:|---:|---|\n" + "\n".join(
+                    f"| {level} | \\{format_price(level_price)} | {format_pct(dist)} | {status} |"
+                    for (level, status), level_price, dist in zip(target_rows, levels, dist_pct)
+                ))
             
             # --- Timestamp ---
-            last_update = datetime.now(CENTRAL_TZ).strftime('%Y-%m-%d %H:%M:%S %Z')
+            # Same instant the refresh check used; %Z keeps CST/CDT right across DST changes
+            last_update = datetime.fromtimestamp(current_time, CENTRAL_TZ).strftime('%Y-%m-%d %H:%M:%S %Z')
             
             if auto_refresh:
-                next_refresh_in = int(refresh_sec - time_since_refresh)
+                next_refresh_in = int(refresh_sec - (current_time - st.session_state.last_refresh_time))
                 st.caption(f"🕐 Last updated: {last_update} | Next refresh in: {max(0, next_refresh_in)}s")
             else:
                 st.caption(f"🕐 Last updated: {last_update} | Auto-refresh: OFF")
+
+
+with tab5:
+    st.header("📡 Live Trade Tracker")
+    
+    # Initialize session state
+    if 'last_refresh_time' not in st.session_state:
+        st.session_state.last_refresh_time = time.time()
+    if 'tracker_symbol' not in st.session_state:
+        st.session_state.tracker_symbol = "GIGGLEUSDT"
+    # The target inputs own these keys, so their values persist without being copied back each run
+    for target_key, default in {'tracker_be': 196.0, 'tracker_tp1': 199.1, 'tracker_tp2': 200.2, 'tracker_sl': 189.5}.items():
+        st.session_state.setdefault(target_key, default)
+    
+    # --- User Inputs ---
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        symbol = st.text_input(
+            "Trading Pair", 
+            value=st.session_state.tracker_symbol,
+            help="e.g., BTCUSDT, GIGGLEUSDT"
+        ).upper()
+        st.session_state.tracker_symbol = symbol
+    
+    with col2:
+        refresh_sec = st.number_input(
+            "Refresh Interval (sec)", 
+            min_value=5, 
+            max_value=120, 
+            value=20,
+            help="Auto-refresh interval"
+        )
     
-    # --- Auto-refresh logic ---
-    if auto_refresh and time_since_refresh >= refresh_sec:
-        time.sleep(1)  # Small delay to prevent hammering
-        st.rerun()
\ No newline at end of file
+    with col3:
+        st.markdown("<br>", unsafe_allow_html=True)
+        auto_refresh = st.toggle("🔄 Auto-Refresh", value=False)
+    
+    st.markdown("---")
+    
+    # Auto-refresh ticks, target edits and Refresh Now rerun only the panel fragment, not the whole app
+    st.fragment(run_every=refresh_sec if auto_refresh else None)(render_live_panel)(
+        symbol, auto_refresh, refresh_sec
+    )